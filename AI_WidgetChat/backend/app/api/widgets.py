@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
@@ -210,12 +211,14 @@ async def get_widget_data(
         WidgetCache.expires_at > datetime.now()
     ).first()
     
+    # Widget payloads are returned as-is rather than being re-validated through
+    # WidgetDataResponse; the model still documents the response shape
     if cached_data:
-        return WidgetDataResponse(
-            widget_data=cached_data.data,
-            cached=True,
-            expires_at=cached_data.expires_at
-        )
+        return ORJSONResponse({
+            "widget_data": cached_data.data,
+            "cached": True,
+            "expires_at": cached_data.expires_at
+        })
     
     # Generate new data
     try:
@@ -239,11 +242,11 @@ async def get_widget_data(
         db.add(cache_entry)
         db.commit()
         
-        return WidgetDataResponse(
-            widget_data=widget_data,
-            cached=False,
-            expires_at=expires_at
-        )
+        return ORJSONResponse({
+            "widget_data": widget_data,
+            "cached": False,
+            "expires_at": expires_at
+        })
         
     except Exception as e:
         raise HTTPException(
@@ -1,19 +1,27 @@
+import orjson
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 from app.config import settings
 
+
+def _json_serializer(value) -> str:
+    """Serialize JSON columns with orjson, which writes datetime values as ISO-8601 natively"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create database engine
 if settings.database_url.startswith("sqlite"):
     engine = create_engine(
         settings.database_url,
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
-        echo=settings.debug
+        echo=settings.debug,
+        json_serializer=_json_serializer
     )
 else:
-    engine = create_engine(settings.database_url, echo=settings.debug)
+    engine = create_engine(settings.database_url, echo=settings.debug, json_serializer=_json_serializer)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,6 +1,6 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import os
 
@@ -15,7 +15,8 @@ app = FastAPI(
     description="Backend API for AI-powered chat application with dynamic widgets",
     version="1.0.0",
     docs_url="/docs" if settings.debug else None,
-    redoc_url="/redoc" if settings.debug else None
+    redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -62,7 +63,7 @@ async def global_exception_handler(request, exc):
     """Global exception handler"""
     if settings.debug:
         import traceback
-        return JSONResponse(
+        return ORJSONResponse(
             status_code=500,
             content={
                 "error": "Internal server error",
@@ -70,7 +71,7 @@ async def global_exception_handler(request, exc):
                 "traceback": traceback.format_exc()
             }
         )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"error": "Internal server error"}
     )
@@ -142,8 +142,8 @@ class ExternalAPIService:
     async def get_time(self, timezone_str: str = "UTC", location: Optional[str] = None) -> Dict[str, Any]:
         """Get current time for a specific timezone"""
         try:
-            # Get current local server time first
-            local_now = datetime.now()
+            # Get current local server time first, aware of the local timezone
+            local_aware = datetime.now().astimezone()
             
             # Get timezone object
             if timezone_str == "UTC":
@@ -151,12 +151,7 @@ class ExternalAPIService:
             else:
                 tz = pytz.timezone(timezone_str)
             
-            # Convert local time to the requested timezone
-            # First get the local timezone
-            local_tz = datetime.now().astimezone().tzinfo
-            
             # Convert local time to target timezone
-            local_aware = local_now.replace(tzinfo=local_tz)
             target_time = local_aware.astimezone(tz)
             
             return {
@@ -255,6 +250,7 @@ class ExternalAPIService:
         ]
         
         top_stocks = []
+        now_iso = datetime.now().isoformat()
         
         for i, symbol in enumerate(stock_symbols[:limit]):
             base_price = random.uniform(50, 800)
@@ -274,7 +270,7 @@ class ExternalAPIService:
                 "low": round(base_price - random.uniform(0, 8), 2),
                 "open": round(base_price + random.uniform(-3, 3), 2),
                 "previous_close": round(base_price - change, 2),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso,
                 "mock": True
             }
             
@@ -287,13 +283,14 @@ class ExternalAPIService:
     
     def _get_mock_news_data(self, query: str) -> Dict[str, Any]:
         """Return mock news data for testing"""
+        now_iso = datetime.now().isoformat()
         mock_articles = [
             {
                 "title": f"Breaking: {query.title()} makes headlines today",
                 "description": f"Latest developments in {query} are capturing global attention.",
                 "url": "https://example.com/news1",
                 "source": "Mock News",
-                "published_at": datetime.now().isoformat(),
+                "published_at": now_iso,
                 "url_to_image": None
             },
             {
@@ -301,7 +298,7 @@ class ExternalAPIService:
                 "description": f"Experts weigh in on the implications of recent {query} developments.",
                 "url": "https://example.com/news2",
                 "source": "Mock Analytics",
-                "published_at": datetime.now().isoformat(),
+                "published_at": now_iso,
                 "url_to_image": None
             },
             {
@@ -309,7 +306,7 @@ class ExternalAPIService:
                 "description": f"How {query} is affecting global markets and industries.",
                 "url": "https://example.com/news3",
                 "source": "Mock Financial",
-                "published_at": datetime.now().isoformat(),
+                "published_at": now_iso,
                 "url_to_image": None
             }
         ]
@@ -318,16 +315,14 @@ class ExternalAPIService:
             "query": query,
             "total_results": len(mock_articles),
             "articles": mock_articles,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "mock": True
         }
     
     def _get_mock_time_data(self, timezone_str: str, location: Optional[str]) -> Dict[str, Any]:
         """Return mock time data for testing"""
         # Use local server time for mock data
-        local_now = datetime.now()
-        local_tz = datetime.now().astimezone().tzinfo
-        local_aware = local_now.replace(tzinfo=local_tz)
+        local_aware = datetime.now().astimezone()
         
         # Convert to target timezone if not UTC
         if timezone_str == "UTC":
@@ -1,6 +1,8 @@
 import json
 import asyncio
 import os
+import re
+from datetime import datetime
 from typing import Dict, List, Optional, Any
 from google.cloud import aiplatform
 from google.oauth2 import service_account
@@ -13,6 +15,10 @@ from app.services.banking_api import BankingAPIService
 from app.services.widget_service import WidgetService
 
 
+# First standalone number in a message, used by the limit extractors
+_NUMBER_PATTERN = re.compile(r'\b(\d+)\b')
+
+
 class LLMService:
     """Service for handling LLM interactions with VertexAI and function calling"""
     
@@ -332,7 +338,7 @@ class LLMService:
         """Execute a function call and return widget data"""
         try:
             function_name = function_call.name
-            args = dict(function_call.args)
+            args = function_call.args
             
             if function_name == "get_weather":
                 location = args.get("location")
@@ -539,15 +545,12 @@ class LLMService:
     
     def _extract_top_stocks_limit(self, message: str) -> int:
         """Extract limit for top stocks from message"""
-        import re
-        
-        # Look for numbers in the message
-        numbers = re.findall(r'\b(\d+)\b', message)
+        # Look for the first number in the message
+        match = _NUMBER_PATTERN.search(message)
         
-        if numbers:
-            limit = int(numbers[0])
+        if match:
             # Ensure limit is within reasonable bounds
-            return min(max(limit, 1), 20)
+            return min(max(int(match.group(1)), 1), 20)
         
         return 10  # Default limit
     
@@ -588,21 +591,17 @@ class LLMService:
             }
         elif any(word in message_lower for word in ['time', 'clock', 'hour', 'minute']):
             # Clock widget doesn't need external APIs
-            try:
-                import datetime
-                current_time = datetime.datetime.now().strftime("%H:%M:%S")
-                return {
-                    "content": f"The current time is {current_time}.",
-                    "widgets": [{
-                        "id": "clock-1",
-                        "type": "clock",
-                        "title": "Current Time",
-                        "data": {"time": current_time},
-                        "config": {"size": "small", "theme": "light"}
-                    }]
-                }
-            except Exception:
-                pass
+            current_time = datetime.now().strftime("%H:%M:%S")
+            return {
+                "content": f"The current time is {current_time}.",
+                "widgets": [{
+                    "id": "clock-1",
+                    "type": "clock",
+                    "title": "Current Time",
+                    "data": {"time": current_time},
+                    "config": {"size": "small", "theme": "light"}
+                }]
+            }
         
         # Default response
         return {
@@ -683,12 +682,9 @@ class LLMService:
     
     def _extract_transaction_limit(self, message: str) -> int:
         """Extract transaction limit from message"""
-        import re
-        
-        numbers = re.findall(r'\b(\d+)\b', message)
-        if numbers:
-            limit = int(numbers[0])
-            return min(max(limit, 1), 50)
+        match = _NUMBER_PATTERN.search(message)
+        if match:
+            return min(max(int(match.group(1)), 1), 50)
         
         return 10  # Default limit
     
@@ -711,12 +707,9 @@ class LLMService:
     
     def _extract_offer_limit(self, message: str) -> int:
         """Extract offer limit from message"""
-        import re
-        
-        numbers = re.findall(r'\b(\d+)\b', message)
-        if numbers:
-            limit = int(numbers[0])
-            return min(max(limit, 1), 20)
+        match = _NUMBER_PATTERN.search(message)
+        if match:
+            return min(max(int(match.group(1)), 1), 20)
         
         return 10  # Default limit
     
@@ -1,5 +1,7 @@
 import uuid
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Sequence, Tuple
 from datetime import datetime
 from app.widgets.base import BaseWidget
 from app.widgets.weather import WeatherWidget
@@ -15,6 +17,34 @@ from app.widgets.banking.payments import PaymentsWidget
 from app.widgets.banking.banker import BankerWidget
 
 
+# Refresh interval per widget type, in seconds
+_REFRESH_INTERVALS = MappingProxyType({
+    "weather": 300,    # 5 minutes
+    "stock": 60,       # 1 minute
+    "news": 600,       # 10 minutes
+    "clock": 30,       # 30 seconds
+    # Banking widgets
+    "banking_accounts": 300,      # 5 minutes
+    "banking_transactions": 60,   # 1 minute
+    "banking_offers": 3600,       # 1 hour
+    "banking_payments": 300,      # 5 minutes
+    "banking_banker": 1800        # 30 minutes
+})
+
+_AUTO_REFRESH_WIDGETS = frozenset({"weather", "stock", "clock", "banking_accounts", "banking_transactions"})
+
+# Static parts of the widget protocol object
+_PROTOCOL_SOURCE = "ai_widget_chat"
+_PROTOCOL_VERSION = "1.0.0"
+_NO_ACTIONS = ()
+
+
+@lru_cache(maxsize=None)
+def _shared_widget(widget_class: type) -> BaseWidget:
+    """Return the process-wide instance of a widget class"""
+    return widget_class()
+
+
 class WidgetService:
     """Service for managing widget protocols and data"""
     
@@ -32,61 +62,70 @@ class WidgetService:
             "banking_payments": PaymentsWidget,
             "banking_banker": BankerWidget
         }
+        # Widgets hold no per-request state, so every service shares one instance per type
+        self._widget_instances = {
+            widget_type: _shared_widget(widget_class)
+            for widget_type, widget_class in self.widget_registry.items()
+        }
+        self._creators = {
+            widget_type: widget.create_widget_data
+            for widget_type, widget in self._widget_instances.items()
+        }
+    
+    def create(self, widget_type: str, *args, **kwargs) -> Dict[str, Any]:
+        """Create a widget of the given type, passing arguments through to its create_widget_data"""
+        return self._creators[widget_type](*args, **kwargs)
+    
+    def create_many(self, specs: Sequence[Tuple[str, Sequence[Any]]]) -> List[Dict[str, Any]]:
+        """Create several widgets from (widget_type, args) pairs, stamped with one shared clock reading"""
+        now = datetime.now()
+        creators = self._creators
+        return [creators[widget_type](*args, now=now) for widget_type, args in specs]
     
     def create_weather_widget(self, location: str, weather_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a weather widget with the provided data"""
-        widget = WeatherWidget()
-        return widget.create_widget_data(location, weather_data)
+        return self._creators["weather"](location, weather_data)
     
     def create_stock_widget(self, symbol: str, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a stock widget with the provided data"""
-        widget = StockWidget()
-        return widget.create_widget_data(symbol, stock_data)
+        return self._creators["stock"](symbol, stock_data)
     
     def create_news_widget(self, query: str, news_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a news widget with the provided data"""
-        widget = NewsWidget()
-        return widget.create_widget_data(query, news_data)
+        return self._creators["news"](query, news_data)
     
     def create_clock_widget(self, timezone: str, location: Optional[str], time_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a clock widget with the provided data"""
-        widget = ClockWidget()
-        return widget.create_widget_data(timezone, location, time_data)
+        return self._creators["clock"](timezone, location, time_data)
     
     def create_top_stocks_widget(self, stocks_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Create a top stocks widget with the provided data"""
-        widget = TopStocksWidget()
-        return widget.create_widget_data(stocks_data)
+        return self._creators["top_stocks"](stocks_data)
     
     # Banking widget creation methods
     def create_banking_accounts_widget(self, accounts_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a banking accounts widget with the provided data"""
-        widget = AccountsWidget()
-        return widget.create_widget_data(accounts_data)
+        return self._creators["banking_accounts"](accounts_data)
     
     def create_banking_transactions_widget(self, account_id: str, transactions_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a banking transactions widget with the provided data"""
-        widget = TransactionsWidget()
-        return widget.create_widget_data(account_id, transactions_data)
+        return self._creators["banking_transactions"](account_id, transactions_data)
     
     def create_banking_offers_widget(self, offers_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a banking offers widget with the provided data"""
-        widget = OffersWidget()
-        return widget.create_widget_data(offers_data)
+        return self._creators["banking_offers"](offers_data)
     
     def create_banking_payments_widget(self, payment_type: str, payment_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a banking payments widget with the provided data"""
-        widget = PaymentsWidget()
-        return widget.create_widget_data(payment_type, payment_data)
+        return self._creators["banking_payments"](payment_type, payment_data)
     
     def create_banking_banker_widget(self, banker_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a banking banker widget with the provided data"""
-        widget = BankerWidget()
-        return widget.create_widget_data(banker_data)
+        return self._creators["banking_banker"](banker_data)
     
     def get_widget_by_type(self, widget_type: str) -> Optional[BaseWidget]:
-        """Get widget class by type"""
-        return self.widget_registry.get(widget_type)
+        """Get widget instance by type"""
+        return self._widget_instances.get(widget_type)
     
     def get_available_widget_types(self) -> List[str]:
         """Get list of available widget types"""
@@ -94,25 +133,22 @@ class WidgetService:
     
     def validate_widget_config(self, widget_type: str, config: Dict[str, Any]) -> bool:
         """Validate widget configuration"""
-        widget_class = self.get_widget_by_type(widget_type)
-        if not widget_class:
+        widget = self.get_widget_by_type(widget_type)
+        if not widget:
             return False
         
         try:
-            # Create a temporary widget instance to validate config
-            widget = widget_class()
             return widget.validate_config(config)
         except Exception:
             return False
     
     def get_widget_default_config(self, widget_type: str) -> Dict[str, Any]:
         """Get default configuration for a widget type"""
-        widget_class = self.get_widget_by_type(widget_type)
-        if not widget_class:
+        widget = self.get_widget_by_type(widget_type)
+        if not widget:
             return {}
         
-        widget = widget_class()
-        return widget.get_default_config()
+        return widget.default_config
     
     def create_widget_protocol(
         self,
@@ -123,28 +159,26 @@ class WidgetService:
         actions: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """Create a standardized widget protocol object"""
-        widget_class = self.get_widget_by_type(widget_type)
-        if not widget_class:
+        widget = self.get_widget_by_type(widget_type)
+        if not widget:
             raise ValueError(f"Unknown widget type: {widget_type}")
         
-        widget = widget_class()
-        default_config = widget.get_default_config()
-        
-        if config:
-            default_config.update(config)
+        # Merge into a new dict so the shared default config is never mutated
+        default_config = {**widget.default_config, **(config or {})}
+        now_iso = datetime.now().isoformat()
         
         return {
-            "id": str(uuid.uuid4()),
+            "id": uuid.uuid4().hex,
             "type": widget_type,
             "title": title,
             "data": data,
             "config": default_config,
-            "actions": actions or [],
+            "actions": actions or _NO_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "source": "ai_widget_chat",
-                "version": "1.0.0"
+                "created_at": now_iso,
+                "updated_at": now_iso,
+                "source": _PROTOCOL_SOURCE,
+                "version": _PROTOCOL_VERSION
             }
         }
     
@@ -160,21 +194,8 @@ class WidgetService:
     
     def get_widget_refresh_interval(self, widget_type: str) -> int:
         """Get refresh interval for a widget type (in seconds)"""
-        refresh_intervals = {
-            "weather": 300,    # 5 minutes
-            "stock": 60,       # 1 minute
-            "news": 600,       # 10 minutes
-            "clock": 30,       # 30 seconds
-            # Banking widgets
-            "banking_accounts": 300,      # 5 minutes
-            "banking_transactions": 60,   # 1 minute
-            "banking_offers": 3600,       # 1 hour
-            "banking_payments": 300,      # 5 minutes
-            "banking_banker": 1800        # 30 minutes
-        }
-        return refresh_intervals.get(widget_type, 300)
+        return _REFRESH_INTERVALS.get(widget_type, 300)
     
     def should_auto_refresh(self, widget_type: str) -> bool:
         """Determine if a widget should auto-refresh"""
-        auto_refresh_widgets = ["weather", "stock", "clock", "banking_accounts", "banking_transactions"]
-        return widget_type in auto_refresh_widgets
+        return widget_type in _AUTO_REFRESH_WIDGETS
@@ -1,4 +1,5 @@
-from typing import Dict, List, Any, Optional
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 from app.widgets.banking.base import BaseBankingWidget
 
@@ -6,38 +7,82 @@ from app.widgets.banking.base import BaseBankingWidget
 class AccountsWidget(BaseBankingWidget):
     """Banking accounts widget implementation"""
     
+    __slots__ = ()
+    
+    # Built once per class; shared by every instance and widget payload
+    _DEFAULT_CONFIG = {
+        **BaseBankingWidget.BANKING_CONFIG,
+        "size": "large",
+        "theme": "banking",
+        "show_account_types": True,
+        "show_balances": True,
+        "show_last_activity": True,
+        "group_by_type": True,
+        "sort_by": "balance"  # balance, name, last_activity
+    }
+    
+    _SUPPORTED_ACTIONS = BaseBankingWidget.BANKING_ACTIONS + (
+        {
+            "type": "filter",
+            "label": "Filter by Type",
+            "icon": "filter_list",
+            "description": "Filter accounts by type"
+        },
+        {
+            "type": "sort",
+            "label": "Sort Accounts",
+            "icon": "sort",
+            "description": "Change sorting order"
+        },
+        {
+            "type": "add_account",
+            "label": "Add Account",
+            "icon": "add",
+            "description": "Add new account"
+        }
+    )
+    
+    # Empty payload shown alongside the message in error widgets
+    _EMPTY_DATA = {
+        "accounts": [],
+        "summary": {
+            "total_accounts": 0,
+            "active_accounts": 0,
+            "total_balance": 0,
+            "total_balance_formatted": "$0.00",
+            "account_types": []
+        }
+    }
+    
+    _REQUIRED_CONFIG_FIELDS = frozenset({"size", "theme", "show_balances"})
+    _SORT_OPTIONS = frozenset({"balance", "name", "last_activity"})
+    
     def get_widget_type(self) -> str:
         return "banking_accounts"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        base_config = super().get_banking_config()
-        base_config.update({
-            "size": "large",
-            "theme": "banking",
-            "show_account_types": True,
-            "show_balances": True,
-            "show_last_activity": True,
-            "group_by_type": True,
-            "sort_by": "balance"  # balance, name, last_activity
-        })
-        return base_config
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
     
-    def create_widget_data(self, accounts_data: Dict[str, Any]) -> Dict[str, Any]:
+    def create_widget_data(self, accounts_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create accounts widget data"""
         try:
-            formatted_data = self.format_data(accounts_data)
+            now = now or datetime.now()
+            if not isinstance(accounts_data.get("accounts", []), list):
+                raise ValueError("accounts must be a list")
+            formatted_data = self.format_data(accounts_data, now=now)
             
             widget_data = {
-                "id": f"accounts_{int(datetime.now().timestamp())}",
+                "id": f"accounts_{self.next_id_suffix()}",
                 "type": "banking_accounts",
                 "title": "My Accounts",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
-                    "source": "banking_api" if not accounts_data.get("mock") else "mock",
+                    "created_at": now,
+                    "updated_at": now,
+                    "source": self.SOURCE_MOCK if accounts_data.get("mock") else self.SOURCE_API,
                     "version": "1.0.0"
                 }
             }
@@ -47,72 +92,70 @@ class AccountsWidget(BaseBankingWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create accounts widget: {str(e)}")
     
-    def format_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def format_data(self, raw_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Format accounts data for display"""
-        try:
-            accounts = raw_data.get("accounts", [])
-            
-            # Calculate totals
-            total_balance = sum(acc.get("balance", 0) for acc in accounts)
-            active_accounts = len([acc for acc in accounts if acc.get("status") == "active"])
+        accounts = raw_data.get("accounts", [])
+        
+        # Totals, grouping and formatting are all done in a single pass
+        format_currency = self.format_currency
+        format_date = self.format_date
+        total_balance = 0
+        active_accounts = 0
+        accounts_by_type = defaultdict(list)
+        formatted_accounts = []
+        for account in accounts:
+            get = account.get
+            balance = get("balance", 0)
+            status = get("status", "unknown")
+            last_activity = get("last_activity", "")
             
-            # Group accounts by type
-            accounts_by_type = {}
-            for account in accounts:
-                acc_type = account.get("type", "other")
-                if acc_type not in accounts_by_type:
-                    accounts_by_type[acc_type] = []
-                accounts_by_type[acc_type].append(account)
+            total_balance += balance
+            if status == "active":
+                active_accounts += 1
             
-            # Format each account
-            formatted_accounts = []
-            for account in accounts:
-                formatted_account = {
-                    "id": account.get("id", ""),
-                    "account_number": account.get("account_number", ""),
-                    "name": account.get("name", ""),
-                    "type": account.get("type", ""),
-                    "balance": account.get("balance", 0),
-                    "balance_formatted": self.format_currency(account.get("balance", 0)),
-                    "currency": account.get("currency", "USD"),
-                    "status": account.get("status", "unknown"),
-                    "last_activity": account.get("last_activity", ""),
-                    "last_activity_formatted": self.format_date(account.get("last_activity", "")),
-                    "is_positive": account.get("balance", 0) >= 0
-                }
-                formatted_accounts.append(formatted_account)
+            accounts_by_type[get("type", "other")].append(account)
             
-            return {
-                "accounts": formatted_accounts,
-                "accounts_by_type": accounts_by_type,
-                "summary": {
-                    "total_accounts": len(accounts),
-                    "active_accounts": active_accounts,
-                    "total_balance": total_balance,
-                    "total_balance_formatted": self.format_currency(total_balance),
-                    "account_types": list(accounts_by_type.keys())
-                },
-                "timestamp": raw_data.get("timestamp", datetime.now().isoformat()),
-                "mock": raw_data.get("mock", False)
+            formatted_account = {
+                "id": get("id", ""),
+                "account_number": get("account_number", ""),
+                "name": get("name", ""),
+                "type": get("type", ""),
+                "balance": balance,
+                "balance_formatted": format_currency(balance),
+                "currency": get("currency", "USD"),
+                "status": status,
+                "last_activity": last_activity,
+                "last_activity_formatted": format_date(last_activity),
+                "is_positive": balance >= 0
             }
-        except Exception as e:
-            return {"error": str(e)}
+            formatted_accounts.append(formatted_account)
+        
+        return {
+            "accounts": formatted_accounts,
+            "accounts_by_type": dict(accounts_by_type),
+            "summary": {
+                "total_accounts": len(accounts),
+                "active_accounts": active_accounts,
+                "total_balance": total_balance,
+                "total_balance_formatted": self.format_currency(total_balance),
+                "account_types": list(accounts_by_type.keys())
+            },
+            "timestamp": raw_data.get("timestamp") or now or datetime.now(),
+            "mock": raw_data.get("mock", False)
+        }
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate accounts widget configuration"""
-        required_fields = ["size", "theme", "show_balances"]
-        
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate size
-        if config["size"] not in ["small", "medium", "large"]:
+        if config["size"] not in self._SIZE_OPTIONS:
             return False
         
         # Validate sort options
         if "sort_by" in config:
-            if config["sort_by"] not in ["balance", "name", "last_activity"]:
+            if config["sort_by"] not in self._SORT_OPTIONS:
                 return False
         
         return True
@@ -126,53 +169,22 @@ class AccountsWidget(BaseBankingWidget):
     def get_display_template(self) -> str:
         return "banking_accounts"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        actions = super().get_banking_actions()
-        actions.extend([
-            {
-                "type": "filter",
-                "label": "Filter by Type",
-                "icon": "filter_list",
-                "description": "Filter accounts by type"
-            },
-            {
-                "type": "sort",
-                "label": "Sort Accounts",
-                "icon": "sort",
-                "description": "Change sorting order"
-            },
-            {
-                "type": "add_account",
-                "label": "Add Account",
-                "icon": "add",
-                "description": "Add new account"
-            }
-        ])
-        return actions
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now = datetime.now()
         return {
-            "id": f"accounts_error_{int(datetime.now().timestamp())}",
+            "id": f"accounts_error_{self.next_id_suffix()}",
             "type": "banking_accounts",
             "title": "Accounts Widget Error",
-            "data": {
-                "error": error_message,
-                "accounts": [],
-                "summary": {
-                    "total_accounts": 0,
-                    "active_accounts": 0,
-                    "total_balance": 0,
-                    "total_balance_formatted": "$0.00",
-                    "account_types": []
-                },
-                "timestamp": datetime.now().isoformat()
-            },
+            "data": {"error": error_message, **self._EMPTY_DATA, "timestamp": now},
             "config": self.default_config,
-            "actions": [{"type": "refresh", "label": "Retry", "icon": "refresh"}],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
                 "source": "error",
                 "version": "1.0.0"
             }
@@ -1,44 +1,124 @@
-from typing import Dict, List, Any, Optional
+import re
+from collections import defaultdict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from datetime import datetime
 from app.widgets.banking.base import BaseBankingWidget
 
 
+_EXPERIENCE_YEARS_PATTERN = re.compile(r'(\d+)')
+
+_WEEKDAYS = {"Mon": 0, "Tue": 1, "Wed": 2, "Thu": 3, "Fri": 4, "Sat": 5, "Sun": 6}
+
+# Availability strings look like "Mon-Fri 9AM-5PM"
+_SCHEDULE_PATTERN = re.compile(
+    r'(Mon|Tue|Wed|Thu|Fri|Sat|Sun)-(Mon|Tue|Wed|Thu|Fri|Sat|Sun)\s*(\d{1,2})(AM|PM)-(\d{1,2})(AM|PM)'
+)
+
+
+def _to_24_hour(hour: str, meridiem: str) -> int:
+    return int(hour) % 12 + (12 if meridiem == "PM" else 0)
+
+
+@lru_cache(maxsize=128)
+def _parse_schedule(availability: str) -> Optional[Tuple[int, int, int, int]]:
+    """Parse an availability string into (first_weekday, last_weekday, start_hour, end_hour)"""
+    match = _SCHEDULE_PATTERN.search(availability)
+    if not match:
+        return None
+    first_day, last_day, start, start_meridiem, end, end_meridiem = match.groups()
+    return (
+        _WEEKDAYS[first_day],
+        _WEEKDAYS[last_day],
+        _to_24_hour(start, start_meridiem),
+        _to_24_hour(end, end_meridiem)
+    )
+
+
 class BankerWidget(BaseBankingWidget):
     """Banking banker contacts widget implementation"""
     
+    __slots__ = ()
+    
+    _DEFAULT_CONFIG = {
+        **BaseBankingWidget.BANKING_CONFIG,
+        "size": "medium",
+        "theme": "banking",
+        "show_contact_info": True,
+        "show_availability": True,
+        "show_specialization": True,
+        "group_by_department": True,
+        "sort_by": "experience",  # experience, name, department
+        "show_languages": True
+    }
+    
+    _SUPPORTED_ACTIONS = BaseBankingWidget.BANKING_ACTIONS + (
+        {
+            "type": "contact",
+            "label": "Contact Banker",
+            "icon": "phone",
+            "description": "Contact selected banker"
+        },
+        {
+            "type": "schedule",
+            "label": "Schedule Meeting",
+            "icon": "event",
+            "description": "Schedule appointment with banker"
+        },
+        {
+            "type": "filter",
+            "label": "Filter by Department",
+            "icon": "filter_list",
+            "description": "Filter bankers by department"
+        },
+        {
+            "type": "search",
+            "label": "Search Bankers",
+            "icon": "search",
+            "description": "Search for specific banker"
+        }
+    )
+    
+    _EMPTY_DATA = {
+        "bankers": [],
+        "summary": {
+            "total_bankers": 0,
+            "available_bankers": 0,
+            "departments": [],
+            "specializations": []
+        }
+    }
+    
+    _REQUIRED_CONFIG_FIELDS = frozenset({"size", "theme"})
+    _SORT_OPTIONS = frozenset({"experience", "name", "department"})
+    
     def get_widget_type(self) -> str:
         return "banking_banker"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        base_config = super().get_banking_config()
-        base_config.update({
-            "size": "medium",
-            "theme": "banking",
-            "show_contact_info": True,
-            "show_availability": True,
-            "show_specialization": True,
-            "group_by_department": True,
-            "sort_by": "experience",  # experience, name, department
-            "show_languages": True
-        })
-        return base_config
-    
-    def create_widget_data(self, banker_data: Dict[str, Any]) -> Dict[str, Any]:
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
+    
+    def create_widget_data(self, banker_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create banker widget data"""
         try:
-            formatted_data = self.format_data(banker_data)
+            now = now or datetime.now()
+            if not isinstance(banker_data.get("bankers", []), list):
+                raise ValueError("bankers must be a list")
+            formatted_data = self.format_data(banker_data, now=now)
             
             widget_data = {
-                "id": f"banker_{int(datetime.now().timestamp())}",
+                "id": f"banker_{self.next_id_suffix()}",
                 "type": "banking_banker",
                 "title": "Banker Contacts",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
-                    "source": "banking_api" if not banker_data.get("mock") else "mock",
+                    "created_at": now,
+                    "updated_at": now,
+                    "source": self.SOURCE_MOCK if banker_data.get("mock") else self.SOURCE_API,
                     "version": "1.0.0"
                 }
             }
@@ -48,91 +128,88 @@ class BankerWidget(BaseBankingWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create banker widget: {str(e)}")
     
-    def format_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def format_data(self, raw_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Format banker data for display"""
-        try:
-            bankers = raw_data.get("bankers", [])
+        bankers = raw_data.get("bankers", [])
+        
+        # Group, collect specializations and format each banker in one pass
+        extract_experience_years = self._extract_experience_years
+        is_banker_available = self._is_banker_available
+        get_contact_methods = self._get_contact_methods
+        get_expertise_level = self._get_expertise_level
+        bankers_by_department = defaultdict(list)
+        specializations = set()
+        available_bankers = 0
+        ranked_bankers = []
+        if now is None:
+            now = datetime.now()
+        for banker in bankers:
+            get = banker.get
+            bankers_by_department[get("department", "other")].append(banker)
             
-            # Group bankers by department
-            bankers_by_department = {}
-            for banker in bankers:
-                department = banker.get("department", "other")
-                if department not in bankers_by_department:
-                    bankers_by_department[department] = []
-                bankers_by_department[department].append(banker)
+            specialization = get("specialization", "")
+            if specialization:
+                specializations.add(specialization)
             
-            # Format each banker
-            formatted_bankers = []
-            for banker in bankers:
-                experience_years = self._extract_experience_years(banker.get("experience", "0 years"))
-                is_available = self._is_banker_available(banker.get("availability", ""))
-                
-                formatted_banker = {
-                    "id": banker.get("id", ""),
-                    "name": banker.get("name", ""),
-                    "title": banker.get("title", ""),
-                    "department": banker.get("department", ""),
-                    "specialization": banker.get("specialization", ""),
-                    "email": banker.get("email", ""),
-                    "phone": banker.get("phone", ""),
-                    "availability": banker.get("availability", ""),
-                    "experience": banker.get("experience", ""),
-                    "experience_years": experience_years,
-                    "languages": banker.get("languages", []),
-                    "is_available": is_available,
-                    "contact_methods": self._get_contact_methods(banker),
-                    "expertise_level": self._get_expertise_level(experience_years)
-                }
-                formatted_bankers.append(formatted_banker)
+            availability = get("availability", "")
+            experience_years = extract_experience_years(get("experience", "0 years"))
+            is_available = is_banker_available(availability, now)
+            if is_available:
+                available_bankers += 1
             
-            # Sort by availability and experience
-            formatted_bankers.sort(key=lambda x: (not x["is_available"], -x["experience_years"]))
-            
-            return {
-                "bankers": formatted_bankers,
-                "bankers_by_department": bankers_by_department,
-                "summary": {
-                    "total_bankers": len(bankers),
-                    "available_bankers": len([b for b in formatted_bankers if b["is_available"]]),
-                    "departments": list(bankers_by_department.keys()),
-                    "specializations": list(set(b["specialization"] for b in bankers if b["specialization"]))
-                },
-                "timestamp": raw_data.get("timestamp", datetime.now().isoformat()),
-                "mock": raw_data.get("mock", False)
+            formatted_banker = {
+                "id": get("id", ""),
+                "name": get("name", ""),
+                "title": get("title", ""),
+                "department": get("department", ""),
+                "specialization": specialization,
+                "email": get("email", ""),
+                "phone": get("phone", ""),
+                "availability": availability,
+                "experience": get("experience", ""),
+                "experience_years": experience_years,
+                "languages": get("languages", []),
+                "is_available": is_available,
+                "contact_methods": get_contact_methods(banker),
+                "expertise_level": get_expertise_level(experience_years)
             }
-        except Exception as e:
-            return {"error": str(e)}
+            ranked_bankers.append(((not is_available, -experience_years), formatted_banker))
+        
+        # Sort by availability and experience
+        ranked_bankers.sort(key=itemgetter(0))
+        formatted_bankers = [banker for _, banker in ranked_bankers]
+        
+        return {
+            "bankers": formatted_bankers,
+            "bankers_by_department": dict(bankers_by_department),
+            "summary": {
+                "total_bankers": len(bankers),
+                "available_bankers": available_bankers,
+                "departments": list(bankers_by_department.keys()),
+                "specializations": list(specializations)
+            },
+            "timestamp": raw_data.get("timestamp", now),
+            "mock": raw_data.get("mock", False)
+        }
     
     def _extract_experience_years(self, experience_str: str) -> int:
         """Extract years of experience from string"""
-        try:
-            import re
-            match = re.search(r'(\d+)', experience_str)
-            return int(match.group(1)) if match else 0
-        except:
+        if not isinstance(experience_str, str):
             return 0
+        match = _EXPERIENCE_YEARS_PATTERN.search(experience_str)
+        return int(match.group(1)) if match else 0
     
-    def _is_banker_available(self, availability: str) -> bool:
-        """Check if banker is currently available"""
-        try:
-            if not availability:
-                return False
-            
-            # Simple check for current time availability
-            now = datetime.now()
-            current_hour = now.hour
-            current_weekday = now.weekday()  # 0 = Monday, 6 = Sunday
-            
-            # Check if it's a weekday and within business hours
-            if "Mon-Fri" in availability and current_weekday < 5:
-                if "9AM-5PM" in availability and 9 <= current_hour < 17:
-                    return True
-                elif "8AM-6PM" in availability and 8 <= current_hour < 18:
-                    return True
-            
+    def _is_banker_available(self, availability: str, now: datetime) -> bool:
+        """Check if banker is available at the given time"""
+        if not availability or not isinstance(availability, str):
             return False
-        except:
+        
+        schedule = _parse_schedule(availability)
+        if not schedule:
             return False
+        
+        first_weekday, last_weekday, start_hour, end_hour = schedule
+        return first_weekday <= now.weekday() <= last_weekday and start_hour <= now.hour < end_hour
     
     def _get_contact_methods(self, banker: Dict[str, Any]) -> List[str]:
         """Get available contact methods for banker"""
@@ -156,15 +233,12 @@ class BankerWidget(BaseBankingWidget):
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate banker widget configuration"""
-        required_fields = ["size", "theme"]
-        
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate sort options
         if "sort_by" in config:
-            if config["sort_by"] not in ["experience", "name", "department"]:
+            if config["sort_by"] not in self._SORT_OPTIONS:
                 return False
         
         return True
@@ -178,58 +252,22 @@ class BankerWidget(BaseBankingWidget):
     def get_display_template(self) -> str:
         return "banking_banker"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        actions = super().get_banking_actions()
-        actions.extend([
-            {
-                "type": "contact",
-                "label": "Contact Banker",
-                "icon": "phone",
-                "description": "Contact selected banker"
-            },
-            {
-                "type": "schedule",
-                "label": "Schedule Meeting",
-                "icon": "event",
-                "description": "Schedule appointment with banker"
-            },
-            {
-                "type": "filter",
-                "label": "Filter by Department",
-                "icon": "filter_list",
-                "description": "Filter bankers by department"
-            },
-            {
-                "type": "search",
-                "label": "Search Bankers",
-                "icon": "search",
-                "description": "Search for specific banker"
-            }
-        ])
-        return actions
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now = datetime.now()
         return {
-            "id": f"banker_error_{int(datetime.now().timestamp())}",
+            "id": f"banker_error_{self.next_id_suffix()}",
             "type": "banking_banker",
             "title": "Banker Widget Error",
-            "data": {
-                "error": error_message,
-                "bankers": [],
-                "summary": {
-                    "total_bankers": 0,
-                    "available_bankers": 0,
-                    "departments": [],
-                    "specializations": []
-                },
-                "timestamp": datetime.now().isoformat()
-            },
+            "data": {"error": error_message, **self._EMPTY_DATA, "timestamp": now},
             "config": self.default_config,
-            "actions": [{"type": "refresh", "label": "Retry", "icon": "refresh"}],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
                 "source": "error",
                 "version": "1.0.0"
             }
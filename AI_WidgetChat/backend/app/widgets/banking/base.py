@@ -1,58 +1,95 @@
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 from app.widgets.base import BaseWidget
 
 
+# Bound str.format per currency code; other codes fall back to "<amount> <code>"
+_CURRENCY_FORMATTERS = {
+    "USD": "${:,.2f}".format
+}
+
+
+@lru_cache(maxsize=2048)
+def _format_currency(amount: float, currency: str) -> str:
+    """Format an amount in the given currency, e.g. '$1,234.50' or '1,234.50 EUR'"""
+    formatter = _CURRENCY_FORMATTERS.get(currency)
+    if formatter is not None:
+        return formatter(amount)
+    return f"{amount:,.2f} {currency}"
+
+
+@lru_cache(maxsize=4096)
+def _format_iso_date(date_str: str) -> str:
+    """Format an ISO-8601 date string as e.g. 'Jan 05, 2024', or return it unchanged"""
+    iso_str = date_str[:-1] + '+00:00' if date_str.endswith('Z') else date_str
+    try:
+        return datetime.fromisoformat(iso_str).strftime("%b %d, %Y")
+    except ValueError:
+        return date_str
+
+
 class BaseBankingWidget(BaseWidget):
     """Base class for all banking widgets"""
     
+    __slots__ = ()
+    
+    BANKING_CONFIG = {
+        "show_balance": True,
+        "show_last_activity": True,
+        "show_status": True,
+        "refresh_interval": 300,  # 5 minutes
+        "security_level": "high"
+    }
+    
+    # Values for a widget's metadata["source"]
+    SOURCE_API = "banking_api"
+    SOURCE_MOCK = "mock"
+    
+    BANKING_ACTIONS = (
+        {
+            "type": "refresh",
+            "label": "Refresh",
+            "icon": "refresh",
+            "description": "Refresh banking data"
+        },
+        {
+            "type": "export",
+            "label": "Export",
+            "icon": "download",
+            "description": "Export data to PDF/CSV"
+        },
+        {
+            "type": "help",
+            "label": "Help",
+            "icon": "help",
+            "description": "Get help with banking features"
+        }
+    )
+    
+    # Error widgets only offer a retry
+    ERROR_ACTIONS = (
+        {"type": "refresh", "label": "Retry", "icon": "refresh"},
+    )
+    
     def get_banking_config(self) -> Dict[str, Any]:
         """Return banking-specific configuration"""
-        return {
-            "show_balance": True,
-            "show_last_activity": True,
-            "show_status": True,
-            "refresh_interval": 300,  # 5 minutes
-            "security_level": "high"
-        }
+        return dict(self.BANKING_CONFIG)
     
     def format_currency(self, amount: float, currency: str = "USD") -> str:
         """Format currency amount for display"""
-        if currency == "USD":
-            return f"${amount:,.2f}"
-        return f"{amount:,.2f} {currency}"
+        return _format_currency(amount, currency)
     
     def format_date(self, date_str: str) -> str:
         """Format date string for display"""
-        try:
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return dt.strftime("%b %d, %Y")
-        except:
+        if not date_str or not isinstance(date_str, str):
             return date_str
+        return _format_iso_date(date_str)
     
     def get_security_icon(self) -> str:
         """Return security icon for banking widgets"""
         return "security"
     
-    def get_banking_actions(self) -> List[Dict[str, Any]]:
+    def get_banking_actions(self) -> Sequence[Dict[str, Any]]:
         """Return common banking actions"""
-        return [
-            {
-                "type": "refresh",
-                "label": "Refresh",
-                "icon": "refresh",
-                "description": "Refresh banking data"
-            },
-            {
-                "type": "export",
-                "label": "Export",
-                "icon": "download",
-                "description": "Export data to PDF/CSV"
-            },
-            {
-                "type": "help",
-                "label": "Help",
-                "icon": "help",
-                "description": "Get help with banking features"
-            }
-        ]
+        return self.BANKING_ACTIONS
@@ -1,44 +1,111 @@
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from operator import itemgetter
 from app.widgets.banking.base import BaseBankingWidget
 
 
+# Base priority per offer type: bonus > cashback > rate reduction
+_TYPE_PRIORITY = {
+    "bonus": 3,
+    "cashback": 2,
+    "rate_reduction": 1
+}
+
+# Dollar amount in an offer value such as "$525" or "$1,200.00"
+_DOLLAR_VALUE_PATTERN = re.compile(r'\$([\d,]*\d(?:\.\d+)?)')
+
+
+@lru_cache(maxsize=256)
+def _parse_expiry(valid_until: str) -> Optional[datetime]:
+    """Parse an ISO-8601 expiry date as an aware datetime, treating naive dates as UTC"""
+    iso_str = valid_until[:-1] + '+00:00' if valid_until.endswith('Z') else valid_until
+    try:
+        expiry_date = datetime.fromisoformat(iso_str)
+    except ValueError:
+        return None
+    if expiry_date.tzinfo is None:
+        expiry_date = expiry_date.replace(tzinfo=timezone.utc)
+    return expiry_date
+
+
 class OffersWidget(BaseBankingWidget):
     """Banking offers widget implementation"""
     
+    __slots__ = ()
+    
+    _DEFAULT_CONFIG = {
+        **BaseBankingWidget.BANKING_CONFIG,
+        "size": "medium",
+        "theme": "banking",
+        "show_offer_details": True,
+        "show_validity": True,
+        "show_requirements": True,
+        "group_by_category": True,
+        "sort_by": "valid_until",  # valid_until, value, category
+        "limit": 10
+    }
+    
+    _SUPPORTED_ACTIONS = BaseBankingWidget.BANKING_ACTIONS + (
+        {
+            "type": "filter",
+            "label": "Filter Offers",
+            "icon": "filter_list",
+            "description": "Filter by category or type"
+        },
+        {
+            "type": "apply",
+            "label": "Apply Offer",
+            "icon": "check_circle",
+            "description": "Apply for selected offer"
+        },
+        {
+            "type": "remind",
+            "label": "Set Reminder",
+            "icon": "alarm",
+            "description": "Set reminder for offer expiry"
+        }
+    )
+    
+    _EMPTY_DATA = {
+        "offers": [],
+        "summary": {
+            "total_offers": 0,
+            "active_offers": 0,
+            "expired_offers": 0,
+            "categories": []
+        }
+    }
+    
+    _REQUIRED_CONFIG_FIELDS = frozenset({"size", "theme", "limit"})
+    _SORT_OPTIONS = frozenset({"valid_until", "value", "category"})
+    
     def get_widget_type(self) -> str:
         return "banking_offers"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        base_config = super().get_banking_config()
-        base_config.update({
-            "size": "medium",
-            "theme": "banking",
-            "show_offer_details": True,
-            "show_validity": True,
-            "show_requirements": True,
-            "group_by_category": True,
-            "sort_by": "valid_until",  # valid_until, value, category
-            "limit": 10
-        })
-        return base_config
-    
-    def create_widget_data(self, offers_data: Dict[str, Any]) -> Dict[str, Any]:
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
+    
+    def create_widget_data(self, offers_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create offers widget data"""
         try:
-            formatted_data = self.format_data(offers_data)
+            now = now or datetime.now()
+            formatted_data = self.format_data(offers_data, now=now)
             
             widget_data = {
-                "id": f"offers_{int(datetime.now().timestamp())}",
+                "id": f"offers_{self.next_id_suffix()}",
                 "type": "banking_offers",
                 "title": "Available Offers",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
-                    "source": "banking_api" if not offers_data.get("mock") else "mock",
+                    "created_at": now,
+                    "updated_at": now,
+                    "source": self.SOURCE_MOCK if offers_data.get("mock") else self.SOURCE_API,
                     "version": "1.0.0"
                 }
             }
@@ -48,121 +115,94 @@ class OffersWidget(BaseBankingWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create offers widget: {str(e)}")
     
-    def format_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def format_data(self, raw_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Format offers data for display"""
         try:
             offers = raw_data.get("offers", [])
             
-            # Group offers by category
-            offers_by_category = {}
-            for offer in offers:
-                category = offer.get("category", "other")
-                if category not in offers_by_category:
-                    offers_by_category[category] = []
-                offers_by_category[category].append(offer)
-            
-            # Format each offer
-            formatted_offers = []
+            # Group, count and format each offer in one pass
+            expiry_status = self._expiry_status
+            get_offer_priority = self._get_offer_priority
+            format_date = self.format_date
+            offers_by_category = defaultdict(list)
+            active_offers = 0
+            ranked_offers = []
+            now_utc = datetime.now(timezone.utc)
             for offer in offers:
-                valid_until = offer.get("valid_until", "")
-                is_expired = self._is_offer_expired(valid_until)
-                days_remaining = self._get_days_remaining(valid_until)
+                get = offer.get
+                offers_by_category[get("category", "other")].append(offer)
+                
+                valid_until = get("valid_until", "")
+                is_expired, days_remaining = expiry_status(valid_until, now_utc)
+                if not is_expired:
+                    active_offers += 1
+                priority = get_offer_priority(offer)
                 
                 formatted_offer = {
-                    "id": offer.get("id", ""),
-                    "title": offer.get("title", ""),
-                    "description": offer.get("description", ""),
-                    "category": offer.get("category", ""),
-                    "type": offer.get("type", ""),
-                    "value": offer.get("value", ""),
+                    "id": get("id", ""),
+                    "title": get("title", ""),
+                    "description": get("description", ""),
+                    "category": get("category", ""),
+                    "type": get("type", ""),
+                    "value": get("value", ""),
                     "valid_until": valid_until,
-                    "valid_until_formatted": self.format_date(valid_until),
-                    "requirements": offer.get("requirements", ""),
-                    "status": offer.get("status", ""),
+                    "valid_until_formatted": format_date(valid_until),
+                    "requirements": get("requirements", ""),
+                    "status": get("status", ""),
                     "is_expired": is_expired,
                     "days_remaining": days_remaining,
-                    "priority": self._get_offer_priority(offer)
+                    "priority": priority
                 }
-                formatted_offers.append(formatted_offer)
+                ranked_offers.append(((is_expired, -priority, valid_until), formatted_offer))
             
             # Sort by priority and validity
-            formatted_offers.sort(key=lambda x: (x["is_expired"], -x["priority"], x["valid_until"]))
+            ranked_offers.sort(key=itemgetter(0))
+            formatted_offers = [offer for _, offer in ranked_offers]
             
             return {
                 "offers": formatted_offers,
-                "offers_by_category": offers_by_category,
+                "offers_by_category": dict(offers_by_category),
                 "summary": {
                     "total_offers": len(offers),
-                    "active_offers": len([o for o in formatted_offers if not o["is_expired"]]),
-                    "expired_offers": len([o for o in formatted_offers if o["is_expired"]]),
+                    "active_offers": active_offers,
+                    "expired_offers": len(offers) - active_offers,
                     "categories": list(offers_by_category.keys())
                 },
-                "timestamp": raw_data.get("timestamp", datetime.now().isoformat()),
+                "timestamp": raw_data.get("timestamp") or now or datetime.now(),
                 "mock": raw_data.get("mock", False)
             }
         except Exception as e:
             return {"error": str(e)}
     
-    def _is_offer_expired(self, valid_until: str) -> bool:
-        """Check if offer is expired"""
-        try:
-            if not valid_until:
-                return False
-            expiry_date = datetime.fromisoformat(valid_until.replace('Z', '+00:00'))
-            return datetime.now(timezone.utc) > expiry_date
-        except:
-            return False
-    
-    def _get_days_remaining(self, valid_until: str) -> int:
-        """Get days remaining for offer"""
-        try:
-            if not valid_until:
-                return 0
-            expiry_date = datetime.fromisoformat(valid_until.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            delta = expiry_date - now
-            return max(0, delta.days)
-        except:
-            return 0
+    def _expiry_status(self, valid_until: str, now_utc: datetime) -> Tuple[bool, int]:
+        """Return (is_expired, days_remaining) for an offer's expiry date"""
+        if not valid_until or not isinstance(valid_until, str):
+            return False, 0
+        expiry_date = _parse_expiry(valid_until)
+        if expiry_date is None:
+            return False, 0
+        delta = expiry_date - now_utc
+        return now_utc > expiry_date, max(0, delta.days)
     
     def _get_offer_priority(self, offer: Dict[str, Any]) -> int:
         """Calculate offer priority based on value and type"""
-        priority = 0
-        
-        # Higher priority for bonus offers
-        if offer.get("type") == "bonus":
-            priority += 3
-        
-        # Higher priority for cashback offers
-        elif offer.get("type") == "cashback":
-            priority += 2
+        priority = _TYPE_PRIORITY.get(offer.get("type"), 0)
         
-        # Higher priority for rate reductions
-        elif offer.get("type") == "rate_reduction":
-            priority += 1
-        
-        # Check value for additional priority
-        value = offer.get("value", "")
-        if "$" in value:
-            try:
-                # Extract numeric value
-                numeric_value = float(value.replace("$", "").replace(",", ""))
-                if numeric_value > 100:
-                    priority += 2
-                elif numeric_value > 50:
-                    priority += 1
-            except:
-                pass
+        # Check dollar value for additional priority
+        match = _DOLLAR_VALUE_PATTERN.search(offer.get("value", ""))
+        if match:
+            numeric_value = float(match.group(1).replace(",", ""))
+            if numeric_value > 100:
+                priority += 2
+            elif numeric_value > 50:
+                priority += 1
         
         return priority
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate offers widget configuration"""
-        required_fields = ["size", "theme", "limit"]
-        
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate limit
         if not isinstance(config["limit"], int) or config["limit"] < 1 or config["limit"] > 50:
@@ -170,7 +210,7 @@ class OffersWidget(BaseBankingWidget):
         
         # Validate sort options
         if "sort_by" in config:
-            if config["sort_by"] not in ["valid_until", "value", "category"]:
+            if config["sort_by"] not in self._SORT_OPTIONS:
                 return False
         
         return True
@@ -184,52 +224,22 @@ class OffersWidget(BaseBankingWidget):
     def get_display_template(self) -> str:
         return "banking_offers"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        actions = super().get_banking_actions()
-        actions.extend([
-            {
-                "type": "filter",
-                "label": "Filter Offers",
-                "icon": "filter_list",
-                "description": "Filter by category or type"
-            },
-            {
-                "type": "apply",
-                "label": "Apply Offer",
-                "icon": "check_circle",
-                "description": "Apply for selected offer"
-            },
-            {
-                "type": "remind",
-                "label": "Set Reminder",
-                "icon": "alarm",
-                "description": "Set reminder for offer expiry"
-            }
-        ])
-        return actions
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now = datetime.now()
         return {
-            "id": f"offers_error_{int(datetime.now().timestamp())}",
+            "id": f"offers_error_{self.next_id_suffix()}",
             "type": "banking_offers",
             "title": "Offers Widget Error",
-            "data": {
-                "error": error_message,
-                "offers": [],
-                "summary": {
-                    "total_offers": 0,
-                    "active_offers": 0,
-                    "expired_offers": 0,
-                    "categories": []
-                },
-                "timestamp": datetime.now().isoformat()
-            },
+            "data": {"error": error_message, **self._EMPTY_DATA, "timestamp": now},
             "config": self.default_config,
-            "actions": [{"type": "refresh", "label": "Retry", "icon": "refresh"}],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
                 "source": "error",
                 "version": "1.0.0"
             }
@@ -1,44 +1,96 @@
-from typing import Dict, List, Any, Optional
+import re
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
+from operator import itemgetter
 from app.widgets.banking.base import BaseBankingWidget
 
 
+# Case-insensitive match for instant processing times such as "Instant" or "instant transfer"
+_INSTANT_PATTERN = re.compile(r'instant', re.IGNORECASE)
+
+
 class PaymentsWidget(BaseBankingWidget):
     """Banking payments widget implementation"""
     
+    __slots__ = ()
+    
+    _DEFAULT_CONFIG = {
+        **BaseBankingWidget.BANKING_CONFIG,
+        "size": "medium",
+        "theme": "banking",
+        "show_payment_details": True,
+        "show_fees": True,
+        "show_processing_time": True,
+        "group_by_type": True,
+        "sort_by": "fee",  # fee, processing_time, type
+        "default_amount": None
+    }
+    
+    _SUPPORTED_ACTIONS = BaseBankingWidget.BANKING_ACTIONS + (
+        {
+            "type": "initiate_payment",
+            "label": "Initiate Payment",
+            "icon": "payment",
+            "description": "Start payment process"
+        },
+        {
+            "type": "schedule",
+            "label": "Schedule Payment",
+            "icon": "schedule",
+            "description": "Schedule future payment"
+        },
+        {
+            "type": "recurring",
+            "label": "Set Recurring",
+            "icon": "repeat",
+            "description": "Set up recurring payment"
+        },
+        {
+            "type": "history",
+            "label": "Payment History",
+            "icon": "history",
+            "description": "View payment history"
+        }
+    )
+    
+    _EMPTY_DATA = {
+        "payment_methods": [],
+        "summary": {
+            "total_methods": 0,
+            "free_methods": 0,
+            "instant_methods": 0,
+            "available_types": []
+        }
+    }
+    
+    _REQUIRED_CONFIG_FIELDS = frozenset({"size", "theme"})
+    _SORT_OPTIONS = frozenset({"fee", "processing_time", "type"})
+    
     def get_widget_type(self) -> str:
         return "banking_payments"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        base_config = super().get_banking_config()
-        base_config.update({
-            "size": "medium",
-            "theme": "banking",
-            "show_payment_details": True,
-            "show_fees": True,
-            "show_processing_time": True,
-            "group_by_type": True,
-            "sort_by": "fee",  # fee, processing_time, type
-            "default_amount": None
-        })
-        return base_config
-    
-    def create_widget_data(self, payment_type: str, payment_data: Dict[str, Any]) -> Dict[str, Any]:
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
+    
+    def create_widget_data(self, payment_type: str, payment_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create payments widget data"""
         try:
-            formatted_data = self.format_data(payment_data)
+            now = now or datetime.now()
+            formatted_data = self.format_data(payment_data, now=now)
             
             widget_data = {
-                "id": f"payments_{payment_type}_{int(datetime.now().timestamp())}",
+                "id": f"payments_{payment_type}_{self.next_id_suffix()}",
                 "type": "banking_payments",
                 "title": f"Payment Options - {payment_type.replace('_', ' ').title()}",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
-                    "source": "banking_api" if not payment_data.get("mock") else "mock",
+                    "created_at": now,
+                    "updated_at": now,
+                    "source": self.SOURCE_MOCK if payment_data.get("mock") else self.SOURCE_API,
                     "version": "1.0.0"
                 }
             }
@@ -48,7 +100,7 @@ class PaymentsWidget(BaseBankingWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create payments widget: {str(e)}")
     
-    def format_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def format_data(self, raw_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Format payments data for display"""
         try:
             payment_links = raw_data.get("payment_links", [])
@@ -57,41 +109,44 @@ class PaymentsWidget(BaseBankingWidget):
             recipient = raw_data.get("recipient")
             
             # Group payment methods by type
-            payment_methods_by_type = {}
+            payment_methods_by_type = defaultdict(list)
             for method in payment_links:
-                method_type = method.get("type", "other")
-                if method_type not in payment_methods_by_type:
-                    payment_methods_by_type[method_type] = []
-                payment_methods_by_type[method_type].append(method)
+                payment_methods_by_type[method.get("type", "other")].append(method)
             
             # Format each payment method
-            formatted_methods = []
+            is_recommended_method = self._is_recommended_method
+            format_currency = self.format_currency
+            ranked_methods = []
             for method in payment_links:
-                fee = method.get("fee", 0)
-                processing_time = method.get("processing_time", "")
+                get = method.get
+                fee = get("fee", 0)
+                processing_time = get("processing_time", "")
+                recommended = is_recommended_method(method, amount)
+                is_free = fee == 0
                 
                 formatted_method = {
-                    "id": method.get("id", ""),
-                    "type": method.get("type", ""),
-                    "name": method.get("name", ""),
-                    "description": method.get("description", ""),
-                    "url": method.get("url", ""),
+                    "id": get("id", ""),
+                    "type": get("type", ""),
+                    "name": get("name", ""),
+                    "description": get("description", ""),
+                    "url": get("url", ""),
                     "fee": fee,
-                    "fee_formatted": self.format_currency(fee),
+                    "fee_formatted": "$0.00" if is_free else format_currency(fee),
                     "processing_time": processing_time,
-                    "is_free": fee == 0,
-                    "is_instant": "instant" in processing_time.lower(),
-                    "recommended": self._is_recommended_method(method, amount)
+                    "is_free": is_free,
+                    "is_instant": _INSTANT_PATTERN.search(processing_time) is not None,
+                    "recommended": recommended
                 }
-                formatted_methods.append(formatted_method)
+                ranked_methods.append(((not recommended, fee), formatted_method))
             
             # Sort by recommendation and fee
-            formatted_methods.sort(key=lambda x: (not x["recommended"], x["fee"]))
+            ranked_methods.sort(key=itemgetter(0))
+            formatted_methods = [method for _, method in ranked_methods]
             
             return {
                 "payment_type": payment_type,
                 "payment_methods": formatted_methods,
-                "payment_methods_by_type": payment_methods_by_type,
+                "payment_methods_by_type": dict(payment_methods_by_type),
                 "context": {
                     "amount": amount,
                     "amount_formatted": self.format_currency(amount) if amount else None,
@@ -103,7 +158,7 @@ class PaymentsWidget(BaseBankingWidget):
                     "instant_methods": len([m for m in formatted_methods if m["is_instant"]]),
                     "available_types": list(payment_methods_by_type.keys())
                 },
-                "timestamp": raw_data.get("timestamp", datetime.now().isoformat()),
+                "timestamp": raw_data.get("timestamp") or now or datetime.now(),
                 "mock": raw_data.get("mock", False)
             }
         except Exception as e:
@@ -131,15 +186,12 @@ class PaymentsWidget(BaseBankingWidget):
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate payments widget configuration"""
-        required_fields = ["size", "theme"]
-        
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate sort options
         if "sort_by" in config:
-            if config["sort_by"] not in ["fee", "processing_time", "type"]:
+            if config["sort_by"] not in self._SORT_OPTIONS:
                 return False
         
         return True
@@ -153,58 +205,22 @@ class PaymentsWidget(BaseBankingWidget):
     def get_display_template(self) -> str:
         return "banking_payments"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        actions = super().get_banking_actions()
-        actions.extend([
-            {
-                "type": "initiate_payment",
-                "label": "Initiate Payment",
-                "icon": "payment",
-                "description": "Start payment process"
-            },
-            {
-                "type": "schedule",
-                "label": "Schedule Payment",
-                "icon": "schedule",
-                "description": "Schedule future payment"
-            },
-            {
-                "type": "recurring",
-                "label": "Set Recurring",
-                "icon": "repeat",
-                "description": "Set up recurring payment"
-            },
-            {
-                "type": "history",
-                "label": "Payment History",
-                "icon": "history",
-                "description": "View payment history"
-            }
-        ])
-        return actions
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now = datetime.now()
         return {
-            "id": f"payments_error_{int(datetime.now().timestamp())}",
+            "id": f"payments_error_{self.next_id_suffix()}",
             "type": "banking_payments",
             "title": "Payments Widget Error",
-            "data": {
-                "error": error_message,
-                "payment_methods": [],
-                "summary": {
-                    "total_methods": 0,
-                    "free_methods": 0,
-                    "instant_methods": 0,
-                    "available_types": []
-                },
-                "timestamp": datetime.now().isoformat()
-            },
+            "data": {"error": error_message, **self._EMPTY_DATA, "timestamp": now},
             "config": self.default_config,
-            "actions": [{"type": "refresh", "label": "Retry", "icon": "refresh"}],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now,
+                "updated_at": now,
                 "source": "error",
                 "version": "1.0.0"
             }
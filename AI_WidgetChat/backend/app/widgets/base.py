@@ -1,11 +1,62 @@
+import secrets
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from itertools import count
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 
 
+# Widget ids end in the process start time, random bits and a per-process sequence
+# number. The random bits keep ids from worker processes (or a reload) started in
+# the same second apart.
+_ID_PREFIX = f"{int(time.time())}_{secrets.token_hex(4)}_"
+_ID_SEQUENCE = count(1)
+
+
+@lru_cache(maxsize=256)
+def make_id_key(value: str, separator: str) -> str:
+    """Lowercase a value and replace separator with "_" for use in widget ids"""
+    return value.lower().replace(separator, "_")
+
+
 class BaseWidget(ABC):
     """Base class for all widgets"""
     
+    __slots__ = ("widget_type", "default_config")
+    
+    # Actions any widget can offer; subclasses reference these in their action lists
+    COMMON_ACTIONS = {
+        "refresh": {
+            "type": "refresh",
+            "label": "Refresh",
+            "icon": "refresh",
+            "description": "Refresh widget data"
+        },
+        "configure": {
+            "type": "configure",
+            "label": "Configure",
+            "icon": "settings",
+            "description": "Configure widget settings"
+        },
+        "fullscreen": {
+            "type": "fullscreen",
+            "label": "Fullscreen",
+            "icon": "fullscreen",
+            "description": "View in fullscreen"
+        }
+    }
+    
+    # Error widgets only offer a refresh
+    ERROR_ACTIONS = (COMMON_ACTIONS["refresh"],)
+    
+    # Config values checked by validate_config; the tuples keep the display order
+    _REQUIRED_CONFIG_FIELDS = frozenset({"size", "theme"})
+    _SIZE_CHOICES = ("small", "medium", "large")
+    _THEME_CHOICES = ("light", "dark", "auto")
+    _SIZE_OPTIONS = frozenset(_SIZE_CHOICES)
+    _THEME_OPTIONS = frozenset(_THEME_CHOICES)
+    
     def __init__(self):
         self.widget_type = self.get_widget_type()
         self.default_config = self.get_default_config()
@@ -46,44 +97,26 @@ class BaseWidget(ABC):
         """Return the display template for the widget"""
         return "default"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
         """Return list of supported actions for the widget"""
         return []
     
     def create_action(self, action_type: str, **kwargs) -> Dict[str, Any]:
         """Create an action for the widget"""
-        actions = {
-            "refresh": {
-                "type": "refresh",
-                "label": "Refresh",
-                "icon": "refresh",
-                "description": "Refresh widget data"
-            },
-            "configure": {
-                "type": "configure",
-                "label": "Configure",
-                "icon": "settings",
-                "description": "Configure widget settings"
-            },
-            "fullscreen": {
-                "type": "fullscreen",
-                "label": "Fullscreen",
-                "icon": "fullscreen",
-                "description": "View in fullscreen"
-            }
-        }
-        
-        action = actions.get(action_type, {})
-        action.update(kwargs)
-        return action
+        return {**self.COMMON_ACTIONS.get(action_type, {}), **kwargs}
+    
+    @staticmethod
+    def next_id_suffix() -> str:
+        """Return a unique suffix for widget ids"""
+        return f"{_ID_PREFIX}{next(_ID_SEQUENCE)}"
     
-    def get_widget_size_options(self) -> List[str]:
+    def get_widget_size_options(self) -> Sequence[str]:
         """Return available size options for the widget"""
-        return ["small", "medium", "large"]
+        return self._SIZE_CHOICES
     
-    def get_theme_options(self) -> List[str]:
+    def get_theme_options(self) -> Sequence[str]:
         """Return available theme options for the widget"""
-        return ["light", "dark", "auto"]
+        return self._THEME_CHOICES
     
     def should_show_timestamp(self) -> bool:
         """Determine if widget should show timestamp"""
@@ -1,43 +1,140 @@
-from typing import Dict, List, Any, Optional
+import re
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from datetime import datetime
-from app.widgets.base import BaseWidget
+from app.widgets.base import BaseWidget, make_id_key
+
+
+# Dates are normally formatted as "%A, %B %d, %Y", e.g. "Thursday, October 15, 2026"
+_DATE_PATTERN = re.compile(r'(\w+), (\w+) (\d{1,2}), (\d{4})')
+
+# Day number and 4-digit year anywhere within other date strings
+_DAY_PATTERN = re.compile(r'\b(\d{1,2})\b')
+_YEAR_PATTERN = re.compile(r'\b(\d{4})\b')
+
+# (display name, lowercase name) pairs for matching day and month names
+_DAYS = tuple(
+    (day, day.lower())
+    for day in ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+)
+_MONTHS = tuple(
+    (month, month.lower())
+    for month in ("January", "February", "March", "April", "May", "June",
+                  "July", "August", "September", "October", "November", "December")
+)
+
+_DAY_NAMES = {day_lower: day for day, day_lower in _DAYS}
+_MONTH_NAMES = {month_lower: month for month, month_lower in _MONTHS}
+
+_UNKNOWN_DATE_PARTS = ("Unknown", "Unknown", "Unknown", "Unknown")
+
+
+@lru_cache(maxsize=64)
+def _parse_date_parts(date_str: str) -> Tuple[str, str, str, str]:
+    """Split a date string into (day_of_week, month, day, year), using "Unknown" for missing parts"""
+    # Read the usual format in one match; anything else falls back to scanning
+    match = _DATE_PATTERN.fullmatch(date_str)
+    if match:
+        day_name, month_name, day, year = match.groups()
+        day_of_week = _DAY_NAMES.get(day_name.lower())
+        month = _MONTH_NAMES.get(month_name.lower())
+        if day_of_week and month:
+            return day_of_week, month, day, year
+    
+    date_lower = date_str.lower()
+    day_of_week = next((day for day, day_lower in _DAYS if day_lower in date_lower), "Unknown")
+    month = next((month for month, month_lower in _MONTHS if month_lower in date_lower), "Unknown")
+    day_match = _DAY_PATTERN.search(date_str)
+    year_match = _YEAR_PATTERN.search(date_str)
+    return (
+        day_of_week,
+        month,
+        day_match.group(1) if day_match else "Unknown",
+        year_match.group(1) if year_match else "Unknown"
+    )
 
 
 class ClockWidget(BaseWidget):
     """Clock widget implementation"""
     
+    __slots__ = ()
+    
+    _DEFAULT_CONFIG = {
+        "size": "small",
+        "theme": "auto",
+        "refreshInterval": 30,  # 30 seconds
+        "showDate": True,
+        "showSeconds": True,
+        "format24Hour": False,
+        "showTimezone": True,
+        "showDayOfWeek": True
+    }
+    
+    _SUPPORTED_ACTIONS = (
+        BaseWidget.COMMON_ACTIONS["refresh"],
+        BaseWidget.COMMON_ACTIONS["configure"],
+        {
+            "type": "timezone",
+            "label": "Change Timezone",
+            "icon": "schedule",
+            "description": "Change the timezone"
+        },
+        {
+            "type": "world_clock",
+            "label": "World Clock",
+            "icon": "public",
+            "description": "View multiple timezones"
+        }
+    )
+    
+    _EMPTY_DATA = {
+        "timezone": "UTC",
+        "location": "Unknown",
+        "time": {
+            "current": "00:00:00",
+            "formatted_12h": "12:00:00 AM",
+            "formatted_24h": "00:00:00",
+            "hour": 0,
+            "hour_12": 12,
+            "minute": 0,
+            "second": 0,
+            "am_pm": "AM"
+        },
+        "date": {
+            "full": "Unknown Date",
+            "day_of_week": "Unknown",
+            "month": "Unknown",
+            "day": "Unknown",
+            "year": "Unknown"
+        },
+        "utc_offset": "+0000"
+    }
+    
     def get_widget_type(self) -> str:
         return "clock"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        return {
-            "size": "small",
-            "theme": "auto",
-            "refreshInterval": 30,  # 30 seconds
-            "showDate": True,
-            "showSeconds": True,
-            "format24Hour": False,
-            "showTimezone": True,
-            "showDayOfWeek": True
-        }
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
     
-    def create_widget_data(self, timezone: str, location: Optional[str], time_data: Dict[str, Any]) -> Dict[str, Any]:
+    def create_widget_data(self, timezone: str, location: Optional[str], time_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create clock widget data"""
         try:
+            now_iso = (now or datetime.now()).astimezone().isoformat()
             # Format the time data
-            formatted_data = self.format_data(time_data)
+            formatted_data = self.format_data(time_data, now_iso=now_iso)
             
             # Create widget protocol
             widget_data = {
-                "id": f"clock_{timezone.lower().replace('/', '_')}_{int(datetime.now().timestamp())}",
+                "id": f"clock_{make_id_key(timezone, '/')}_{self.next_id_suffix()}",
                 "type": "clock",
                 "title": f"Clock - {location or timezone}",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().astimezone().isoformat(),
-                    "updated_at": datetime.now().astimezone().isoformat(),
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
                     "source": "system" if not time_data.get("mock") else "mock",
                     "version": "1.0.0"
                 }
@@ -48,7 +145,7 @@ class ClockWidget(BaseWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create clock widget: {str(e)}")
     
-    def format_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def format_data(self, raw_data: Dict[str, Any], now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Format time data for display"""
         try:
             current_time = raw_data.get("current_time", "")
@@ -56,24 +153,30 @@ class ClockWidget(BaseWidget):
             date = raw_data.get("date", "")
             
             # Parse the current time to extract components
-            time_parts = current_time.split(" ")
-            time_part = time_parts[0] if time_parts else current_time
-            date_part = time_parts[1] if len(time_parts) > 1 else date
+            time_part = current_time.partition(" ")[0]
             
-            # Extract time components
-            time_components = time_part.split(":")
-            hour = int(time_components[0]) if len(time_components) > 0 else 0
-            minute = int(time_components[1]) if len(time_components) > 1 else 0
-            second = int(time_components[2]) if len(time_components) > 2 else 0
+            # Extract time components, slicing directly for the usual HH:MM:SS shape
+            if len(time_part) == 8 and time_part[2] == ":" and time_part[5] == ":":
+                hour = int(time_part[0:2])
+                minute = int(time_part[3:5])
+                second = int(time_part[6:8])
+            else:
+                time_components = time_part.split(":")
+                hour = int(time_components[0])
+                minute = int(time_components[1]) if len(time_components) > 1 else 0
+                second = int(time_components[2]) if len(time_components) > 2 else 0
             
             # Determine if it's AM or PM
             is_am = hour < 12
             am_pm = "AM" if is_am else "PM"
             
-            # Format hour for 12-hour display
-            hour_12 = hour if hour <= 12 else hour - 12
-            if hour_12 == 0:
-                hour_12 = 12
+            # Format hour for 12-hour display (0 -> 12, 13 -> 1)
+            hour_12 = (hour - 1) % 12 + 1
+            
+            # The date string only changes once a day, so its parts are cached
+            day_of_week, month, day, year = (
+                _parse_date_parts(date) if isinstance(date, str) else _UNKNOWN_DATE_PARTS
+            )
             
             return {
                 "timezone": raw_data.get("timezone", "UTC"),
@@ -90,13 +193,13 @@ class ClockWidget(BaseWidget):
                 },
                 "date": {
                     "full": date,
-                    "day_of_week": self._extract_day_of_week(date),
-                    "month": self._extract_month(date),
-                    "day": self._extract_day(date),
-                    "year": self._extract_year(date)
+                    "day_of_week": day_of_week,
+                    "month": month,
+                    "day": day,
+                    "year": year
                 },
                 "utc_offset": raw_data.get("utc_offset", "+0000"),
-                "timestamp": raw_data.get("timestamp", datetime.now().astimezone().isoformat()),
+                "timestamp": raw_data.get("timestamp") or now_iso or datetime.now().astimezone().isoformat(),
                 "mock": raw_data.get("mock", False)
             }
         except Exception as e:
@@ -104,69 +207,39 @@ class ClockWidget(BaseWidget):
     
     def _extract_day_of_week(self, date_str: str) -> str:
         """Extract day of week from date string"""
-        try:
-            # Common day names
-            days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-            for day in days:
-                if day.lower() in date_str.lower():
-                    return day
-            return "Unknown"
-        except:
+        if not isinstance(date_str, str):
             return "Unknown"
+        return _parse_date_parts(date_str)[0]
     
     def _extract_month(self, date_str: str) -> str:
         """Extract month from date string"""
-        try:
-            # Common month names
-            months = ["January", "February", "March", "April", "May", "June",
-                     "July", "August", "September", "October", "November", "December"]
-            for month in months:
-                if month.lower() in date_str.lower():
-                    return month
-            return "Unknown"
-        except:
+        if not isinstance(date_str, str):
             return "Unknown"
+        return _parse_date_parts(date_str)[1]
     
     def _extract_day(self, date_str: str) -> str:
         """Extract day from date string"""
-        try:
-            import re
-            # Look for day number
-            day_match = re.search(r'\b(\d{1,2})\b', date_str)
-            if day_match:
-                return day_match.group(1)
-            return "Unknown"
-        except:
+        if not isinstance(date_str, str):
             return "Unknown"
+        return _parse_date_parts(date_str)[2]
     
     def _extract_year(self, date_str: str) -> str:
         """Extract year from date string"""
-        try:
-            import re
-            # Look for 4-digit year
-            year_match = re.search(r'\b(\d{4})\b', date_str)
-            if year_match:
-                return year_match.group(1)
-            return "Unknown"
-        except:
+        if not isinstance(date_str, str):
             return "Unknown"
+        return _parse_date_parts(date_str)[3]
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate clock widget configuration"""
-        required_fields = ["size", "theme"]
-        optional_fields = ["refreshInterval", "showDate", "showSeconds", "format24Hour", "showTimezone", "showDayOfWeek"]
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate size
-        if config["size"] not in self.get_widget_size_options():
+        if config["size"] not in self._SIZE_OPTIONS:
             return False
         
         # Validate theme
-        if config["theme"] not in self.get_theme_options():
+        if config["theme"] not in self._THEME_OPTIONS:
             return False
         
         # Validate refresh interval (should be reasonable for clock)
@@ -185,59 +258,22 @@ class ClockWidget(BaseWidget):
     def get_display_template(self) -> str:
         return "clock"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        return [
-            self.create_action("refresh"),
-            self.create_action("configure"),
-            {
-                "type": "timezone",
-                "label": "Change Timezone",
-                "icon": "schedule",
-                "description": "Change the timezone"
-            },
-            {
-                "type": "world_clock",
-                "label": "World Clock",
-                "icon": "public",
-                "description": "View multiple timezones"
-            }
-        ]
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now_iso = datetime.now().astimezone().isoformat()
         return {
-            "id": f"clock_error_{int(datetime.now().timestamp())}",
+            "id": f"clock_error_{self.next_id_suffix()}",
             "type": "clock",
             "title": "Clock Widget Error",
-            "data": {
-                "error": error_message,
-                "timezone": "UTC",
-                "location": "Unknown",
-                "time": {
-                    "current": "00:00:00",
-                    "formatted_12h": "12:00:00 AM",
-                    "formatted_24h": "00:00:00",
-                    "hour": 0,
-                    "hour_12": 12,
-                    "minute": 0,
-                    "second": 0,
-                    "am_pm": "AM"
-                },
-                "date": {
-                    "full": "Unknown Date",
-                    "day_of_week": "Unknown",
-                    "month": "Unknown",
-                    "day": "Unknown",
-                    "year": "Unknown"
-                },
-                "utc_offset": "+0000",
-                "timestamp": datetime.now().astimezone().isoformat()
-            },
+            "data": {"error": error_message, **self._EMPTY_DATA, "timestamp": now_iso},
             "config": self.default_config,
-            "actions": [self.create_action("refresh")],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().astimezone().isoformat(),
-                "updated_at": datetime.now().astimezone().isoformat(),
+                "created_at": now_iso,
+                "updated_at": now_iso,
                 "source": "error",
                 "version": "1.0.0"
             }
@@ -1,43 +1,72 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
-from app.widgets.base import BaseWidget
+from app.widgets.base import BaseWidget, make_id_key
 
 
 class NewsWidget(BaseWidget):
     """News widget implementation"""
     
+    __slots__ = ()
+    
+    _DEFAULT_CONFIG = {
+        "size": "large",
+        "theme": "auto",
+        "refreshInterval": 600,  # 10 minutes
+        "showImages": True,
+        "maxArticles": 5,
+        "showSource": True,
+        "showTimestamp": True,
+        "compactView": False
+    }
+    
+    _SUPPORTED_ACTIONS = (
+        BaseWidget.COMMON_ACTIONS["refresh"],
+        BaseWidget.COMMON_ACTIONS["configure"],
+        {
+            "type": "search",
+            "label": "Search News",
+            "icon": "search",
+            "description": "Search for different news topics"
+        },
+        {
+            "type": "category",
+            "label": "Browse Categories",
+            "icon": "category",
+            "description": "Browse news by category"
+        }
+    )
+    
+    _EMPTY_DATA = {
+        "query": "Error",
+        "total_results": 0,
+        "articles": []
+    }
+    
     def get_widget_type(self) -> str:
         return "news"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        return {
-            "size": "large",
-            "theme": "auto",
-            "refreshInterval": 600,  # 10 minutes
-            "showImages": True,
-            "maxArticles": 5,
-            "showSource": True,
-            "showTimestamp": True,
-            "compactView": False
-        }
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
     
-    def create_widget_data(self, query: str, news_data: Dict[str, Any]) -> Dict[str, Any]:
+    def create_widget_data(self, query: str, news_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create news widget data"""
         try:
+            now_iso = (now or datetime.now()).isoformat()
             # Format the news data
-            formatted_data = self.format_data(news_data)
+            formatted_data = self.format_data(news_data, now_iso=now_iso)
             
             # Create widget protocol
             widget_data = {
-                "id": f"news_{query.lower().replace(' ', '_')}_{int(datetime.now().timestamp())}",
+                "id": f"news_{make_id_key(query, ' ')}_{self.next_id_suffix()}",
                 "type": "news",
                 "title": f"News: {query.title()}",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
                     "source": "newsapi" if not news_data.get("mock") else "mock",
                     "version": "1.0.0"
                 }
@@ -48,22 +77,26 @@ class NewsWidget(BaseWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create news widget: {str(e)}")
     
-    def format_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def format_data(self, raw_data: Dict[str, Any], now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Format news data for display"""
         try:
             articles = raw_data.get("articles", [])
             formatted_articles = []
+            estimate_read_time = self._estimate_read_time
+            create_summary = self._create_summary
             
             for article in articles:
+                get = article.get
+                description = get("description", "")
                 formatted_article = {
-                    "title": article.get("title", "No title"),
-                    "description": article.get("description", ""),
-                    "url": article.get("url", ""),
-                    "source": article.get("source", "Unknown"),
-                    "published_at": article.get("published_at", ""),
-                    "image_url": article.get("url_to_image"),
-                    "read_time": self._estimate_read_time(article.get("description", "")),
-                    "summary": self._create_summary(article.get("description", ""))
+                    "title": get("title", "No title"),
+                    "description": description,
+                    "url": get("url", ""),
+                    "source": get("source", "Unknown"),
+                    "published_at": get("published_at", ""),
+                    "image_url": get("url_to_image"),
+                    "read_time": estimate_read_time(description),
+                    "summary": create_summary(description)
                 }
                 formatted_articles.append(formatted_article)
             
@@ -71,7 +104,7 @@ class NewsWidget(BaseWidget):
                 "query": raw_data.get("query", ""),
                 "total_results": raw_data.get("total_results", 0),
                 "articles": formatted_articles,
-                "timestamp": raw_data.get("timestamp", datetime.now().isoformat()),
+                "timestamp": raw_data.get("timestamp") or now_iso or datetime.now().isoformat(),
                 "mock": raw_data.get("mock", False)
             }
         except Exception as e:
@@ -82,13 +115,11 @@ class NewsWidget(BaseWidget):
         if not text:
             return "1 min"
         
-        words = len(text.split())
-        read_time = max(1, words // 200)  # Average reading speed: 200 words per minute
+        # Counting separators avoids building a list of every word
+        words = text.count(" ") + 1
+        read_time = words // 200  # Average reading speed: 200 words per minute
         
-        if read_time == 1:
-            return "1 min"
-        else:
-            return f"{read_time} mins"
+        return f"{read_time} mins" if read_time > 1 else "1 min"
     
     def _create_summary(self, description: str, max_length: int = 100) -> str:
         """Create a summary of the article description"""
@@ -102,27 +133,22 @@ class NewsWidget(BaseWidget):
         truncated = description[:max_length]
         last_period = truncated.rfind('.')
         
-        if last_period > max_length * 0.7:  # If period is reasonably close to the end
+        if last_period > max_length * 7 // 10:  # If period is reasonably close to the end
             return truncated[:last_period + 1]
         else:
             return truncated + "..."
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate news widget configuration"""
-        required_fields = ["size", "theme"]
-        optional_fields = ["refreshInterval", "showImages", "maxArticles", "showSource", "showTimestamp", "compactView"]
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate size
-        if config["size"] not in self.get_widget_size_options():
+        if config["size"] not in self._SIZE_OPTIONS:
             return False
         
         # Validate theme
-        if config["theme"] not in self.get_theme_options():
+        if config["theme"] not in self._THEME_OPTIONS:
             return False
         
         # Validate max articles
@@ -141,42 +167,22 @@ class NewsWidget(BaseWidget):
     def get_display_template(self) -> str:
         return "news"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        return [
-            self.create_action("refresh"),
-            self.create_action("configure"),
-            {
-                "type": "search",
-                "label": "Search News",
-                "icon": "search",
-                "description": "Search for different news topics"
-            },
-            {
-                "type": "category",
-                "label": "Browse Categories",
-                "icon": "category",
-                "description": "Browse news by category"
-            }
-        ]
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now_iso = datetime.now().isoformat()
         return {
-            "id": f"news_error_{int(datetime.now().timestamp())}",
+            "id": f"news_error_{self.next_id_suffix()}",
             "type": "news",
             "title": "News Widget Error",
-            "data": {
-                "error": error_message,
-                "query": "Error",
-                "total_results": 0,
-                "articles": [],
-                "timestamp": datetime.now().isoformat()
-            },
+            "data": {"error": error_message, **self._EMPTY_DATA, "timestamp": now_iso},
             "config": self.default_config,
-            "actions": [self.create_action("refresh")],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now_iso,
+                "updated_at": now_iso,
                 "source": "error",
                 "version": "1.0.0"
             }
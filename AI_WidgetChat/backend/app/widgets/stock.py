@@ -1,44 +1,99 @@
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Sequence
 from datetime import datetime
 from app.widgets.base import BaseWidget
 
 
+@lru_cache(maxsize=1024)
+def parse_change_percent(change_percent: str) -> float:
+    """Parse a change percentage string such as "1.23%", treating an empty value as 0"""
+    change_percent = change_percent.replace("%", "")
+    return float(change_percent) if change_percent else 0
+
+
 class StockWidget(BaseWidget):
     """Stock widget implementation"""
     
+    __slots__ = ()
+    
+    _DEFAULT_CONFIG = {
+        "size": "medium",
+        "theme": "auto",
+        "refreshInterval": 60,  # 1 minute
+        "showChart": True,
+        "showVolume": True,
+        "showChange": True,
+        "showHighLow": True,
+        "chartType": "line",  # line or bar
+        "timeRange": "1D"  # 1D, 1W, 1M, 3M, 1Y
+    }
+    
+    _SUPPORTED_ACTIONS = (
+        BaseWidget.COMMON_ACTIONS["refresh"],
+        BaseWidget.COMMON_ACTIONS["configure"],
+        {
+            "type": "chart",
+            "label": "View Chart",
+            "icon": "trending_up",
+            "description": "View detailed price chart"
+        },
+        {
+            "type": "news",
+            "label": "Related News",
+            "icon": "newspaper",
+            "description": "View news about this stock"
+        }
+    )
+    
+    _CHART_TYPES = frozenset({"line", "bar"})
+    _TIME_RANGES = frozenset({"1D", "1W", "1M", "3M", "1Y"})
+    
+    _EMPTY_DATA = {
+        "symbol": "ERROR",
+        "company_name": "Error Loading Stock Data",
+        "price": {
+            "current": 0,
+            "open": 0,
+            "previous_close": 0
+        },
+        "change": {
+            "amount": 0,
+            "percentage": 0,
+            "is_positive": True,
+            "formatted": "0.00 (0.00%)"
+        },
+        "range": {
+            "high": 0,
+            "low": 0
+        },
+        "volume": 0
+    }
+    
     def get_widget_type(self) -> str:
         return "stock"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        return {
-            "size": "medium",
-            "theme": "auto",
-            "refreshInterval": 60,  # 1 minute
-            "showChart": True,
-            "showVolume": True,
-            "showChange": True,
-            "showHighLow": True,
-            "chartType": "line",  # line or bar
-            "timeRange": "1D"  # 1D, 1W, 1M, 3M, 1Y
-        }
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
     
-    def create_widget_data(self, symbol: str, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+    def create_widget_data(self, symbol: str, stock_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create stock widget data"""
         try:
+            now_iso = (now or datetime.now()).isoformat()
             # Format the stock data
-            formatted_data = self.format_data(stock_data)
+            formatted_data = self.format_data(stock_data, now_iso=now_iso)
             
             # Create widget protocol
             widget_data = {
-                "id": f"stock_{symbol.lower()}_{int(datetime.now().timestamp())}",
+                "id": f"stock_{symbol.lower()}_{self.next_id_suffix()}",
                 "type": "stock",
                 "title": f"{symbol.upper()} Stock Price",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
                     "source": "alpha_vantage" if not stock_data.get("mock") else "mock",
                     "version": "1.0.0"
                 }
@@ -49,68 +104,65 @@ class StockWidget(BaseWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create stock widget: {str(e)}")
     
-    def format_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def format_data(self, raw_data: Dict[str, Any], now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Format stock data for display"""
         try:
-            # Calculate change percentage
-            change_percent = raw_data.get("change_percent", "0%")
-            if isinstance(change_percent, str):
-                change_percent = change_percent.replace("%", "")
-            
-            change_percent_float = float(change_percent) if change_percent else 0
+            get = raw_data.get
+            # Calculate change percentage; numeric values need no string handling
+            change = get("change", 0)
+            change_percent = get("change_percent", 0)
+            if type(change_percent) is str:
+                change_percent_float = parse_change_percent(change_percent)
+            else:
+                change_percent_float = float(change_percent) if change_percent else 0
             is_positive = change_percent_float >= 0
             
             return {
-                "symbol": raw_data.get("symbol", ""),
-                "company_name": raw_data.get("name", ""),
+                "symbol": get("symbol", ""),
+                "company_name": get("name", ""),
                 "price": {
-                    "current": raw_data.get("price", 0),
-                    "open": raw_data.get("open", 0),
-                    "previous_close": raw_data.get("previous_close", 0)
+                    "current": get("price", 0),
+                    "open": get("open", 0),
+                    "previous_close": get("previous_close", 0)
                 },
                 "change": {
-                    "amount": raw_data.get("change", 0),
+                    "amount": change,
                     "percentage": change_percent_float,
                     "is_positive": is_positive,
-                    "formatted": f"{'+' if is_positive else ''}{raw_data.get('change', 0):.2f} ({'+' if is_positive else ''}{change_percent_float:.2f}%)"
+                    "formatted": f"{change:+.2f} ({change_percent_float:+.2f}%)"
                 },
                 "range": {
-                    "high": raw_data.get("high", 0),
-                    "low": raw_data.get("low", 0)
+                    "high": get("high", 0),
+                    "low": get("low", 0)
                 },
-                "volume": raw_data.get("volume", 0),
-                "timestamp": raw_data.get("timestamp", datetime.now().isoformat()),
-                "mock": raw_data.get("mock", False)
+                "volume": get("volume", 0),
+                "timestamp": get("timestamp") or now_iso or datetime.now().isoformat(),
+                "mock": get("mock", False)
             }
         except Exception as e:
             return {"error": str(e)}
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate stock widget configuration"""
-        required_fields = ["size", "theme"]
-        optional_fields = ["refreshInterval", "showChart", "showVolume", "showChange", "showHighLow", "chartType", "timeRange"]
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate size
-        if config["size"] not in self.get_widget_size_options():
+        if config["size"] not in self._SIZE_OPTIONS:
             return False
         
         # Validate theme
-        if config["theme"] not in self.get_theme_options():
+        if config["theme"] not in self._THEME_OPTIONS:
             return False
         
         # Validate chart type
         if "chartType" in config:
-            if config["chartType"] not in ["line", "bar"]:
+            if config["chartType"] not in self._CHART_TYPES:
                 return False
         
         # Validate time range
         if "timeRange" in config:
-            if config["timeRange"] not in ["1D", "1W", "1M", "3M", "1Y"]:
+            if config["timeRange"] not in self._TIME_RANGES:
                 return False
         
         return True
@@ -124,57 +176,22 @@ class StockWidget(BaseWidget):
     def get_display_template(self) -> str:
         return "stock"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        return [
-            self.create_action("refresh"),
-            self.create_action("configure"),
-            {
-                "type": "chart",
-                "label": "View Chart",
-                "icon": "trending_up",
-                "description": "View detailed price chart"
-            },
-            {
-                "type": "news",
-                "label": "Related News",
-                "icon": "newspaper",
-                "description": "View news about this stock"
-            }
-        ]
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now_iso = datetime.now().isoformat()
         return {
-            "id": f"stock_error_{int(datetime.now().timestamp())}",
+            "id": f"stock_error_{self.next_id_suffix()}",
             "type": "stock",
             "title": "Stock Widget Error",
-            "data": {
-                "error": error_message,
-                "symbol": "ERROR",
-                "company_name": "Error Loading Stock Data",
-                "price": {
-                    "current": 0,
-                    "open": 0,
-                    "previous_close": 0
-                },
-                "change": {
-                    "amount": 0,
-                    "percentage": 0,
-                    "is_positive": True,
-                    "formatted": "0.00 (0.00%)"
-                },
-                "range": {
-                    "high": 0,
-                    "low": 0
-                },
-                "volume": 0,
-                "timestamp": datetime.now().isoformat()
-            },
+            "data": {"error": error_message, **self._EMPTY_DATA, "timestamp": now_iso},
             "config": self.default_config,
-            "actions": [self.create_action("refresh")],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now_iso,
+                "updated_at": now_iso,
                 "source": "error",
                 "version": "1.0.0"
             }
@@ -1,44 +1,85 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 from datetime import datetime
+from itertools import islice
 from app.widgets.base import BaseWidget
+from app.widgets.stock import parse_change_percent
 
 
 class TopStocksWidget(BaseWidget):
     """Top 10 traded stocks widget implementation"""
     
+    __slots__ = ()
+    
+    # Market and ordering reported in every payload and used as the config defaults
+    _MARKET = "US"
+    _SORT_BY = "volume"
+    
+    _DEFAULT_CONFIG = {
+        "size": "large",
+        "theme": "auto",
+        "refreshInterval": 300,  # 5 minutes
+        "showVolume": True,
+        "showChange": True,
+        "showMarketCap": True,
+        "sortBy": _SORT_BY,  # volume, change, market_cap
+        "market": _MARKET  # US, EU, ASIA
+    }
+    
+    _SUPPORTED_ACTIONS = (
+        BaseWidget.COMMON_ACTIONS["refresh"],
+        BaseWidget.COMMON_ACTIONS["configure"],
+        {
+            "type": "sort",
+            "label": "Sort by Volume",
+            "icon": "sort",
+            "description": "Sort stocks by trading volume"
+        },
+        {
+            "type": "sort",
+            "label": "Sort by Change",
+            "icon": "trending_up",
+            "description": "Sort stocks by price change"
+        },
+        {
+            "type": "export",
+            "label": "Export Data",
+            "icon": "download",
+            "description": "Export top stocks data"
+        }
+    )
+    
+    _SORT_OPTIONS = frozenset({"volume", "change", "market_cap"})
+    _MARKETS = frozenset({"US", "EU", "ASIA"})
+    
+    _REQUIRED_FIELDS = ("symbol", "price", "volume")
+    _OPTIONAL_FIELDS = ("change", "market_cap", "company_name", "rank")
+    
     def get_widget_type(self) -> str:
         return "top_stocks"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        return {
-            "size": "large",
-            "theme": "auto",
-            "refreshInterval": 300,  # 5 minutes
-            "showVolume": True,
-            "showChange": True,
-            "showMarketCap": True,
-            "sortBy": "volume",  # volume, change, market_cap
-            "market": "US"  # US, EU, ASIA
-        }
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
     
-    def create_widget_data(self, stocks_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def create_widget_data(self, stocks_data: List[Dict[str, Any]], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create top stocks widget data"""
         try:
-            # Format the stocks data
-            formatted_data = self.format_data(stocks_data)
+            now_iso = (now or datetime.now()).isoformat()
+            # Format the stocks data, noting mock entries in the same pass
+            formatted_data, has_mock = self._format_stocks(stocks_data, now_iso)
             
             # Create widget protocol
             widget_data = {
-                "id": f"top_stocks_{int(datetime.now().timestamp())}",
+                "id": f"top_stocks_{self.next_id_suffix()}",
                 "type": "top_stocks",
                 "title": "Top 10 Traded Stocks",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
-                    "source": "alpha_vantage" if not any(stock.get("mock") for stock in stocks_data) else "mock",
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
+                    "source": "mock" if has_mock else "alpha_vantage",
                     "version": "1.0.0"
                 }
             }
@@ -48,136 +89,122 @@ class TopStocksWidget(BaseWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create top stocks widget: {str(e)}")
     
-    def format_data(self, raw_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def format_data(self, raw_data: List[Dict[str, Any]], now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Format top stocks data for display"""
         try:
-            formatted_stocks = []
-            
-            for stock in raw_data[:10]:  # Limit to top 10
-                # Calculate change percentage
-                change_percent = stock.get("change_percent", "0%")
-                if isinstance(change_percent, str):
-                    change_percent = change_percent.replace("%", "")
-                
+            return self._format_stocks(raw_data, now_iso)[0]
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _format_stocks(self, raw_data: List[Dict[str, Any]], now_iso: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Format top stocks data, also reporting whether any of them is mock data"""
+        if now_iso is None:
+            now_iso = datetime.now().isoformat()
+        formatted_stocks = []
+        append_stock = formatted_stocks.append
+        has_mock = False
+        
+        for rank, stock in enumerate(islice(raw_data, 10), 1):  # Limit to top 10
+            get = stock.get
+            # Calculate change percentage
+            change = get("change", 0)
+            change_percent = get("change_percent", 0)
+            if type(change_percent) is str:
+                change_percent_float = parse_change_percent(change_percent)
+            else:
                 change_percent_float = float(change_percent) if change_percent else 0
-                is_positive = change_percent_float >= 0
-                
-                formatted_stock = {
-                    "symbol": stock.get("symbol", ""),
-                    "company_name": stock.get("name", ""),
-                    "price": {
-                        "current": stock.get("price", 0),
-                        "open": stock.get("open", 0),
-                        "previous_close": stock.get("previous_close", 0)
-                    },
-                    "change": {
-                        "amount": stock.get("change", 0),
-                        "percentage": change_percent_float,
-                        "is_positive": is_positive,
-                        "formatted": f"{'+' if is_positive else ''}{stock.get('change', 0):.2f} ({'+' if is_positive else ''}{change_percent_float:.2f}%)"
-                    },
-                    "volume": stock.get("volume", 0),
-                    "market_cap": stock.get("market_cap", 0),
-                    "rank": len(formatted_stocks) + 1,
-                    "timestamp": stock.get("timestamp", datetime.now().isoformat()),
-                    "mock": stock.get("mock", False)
-                }
-                
-                formatted_stocks.append(formatted_stock)
+            is_positive = change_percent_float >= 0
             
-            return {
-                "stocks": formatted_stocks,
-                "total_count": len(formatted_stocks),
-                "last_updated": datetime.now().isoformat(),
-                "market": "US",
-                "sort_by": "volume"
-            }
+            mock = get("mock", False)
+            if mock:
+                has_mock = True
             
-        except Exception as e:
-            return {"error": str(e)}
+            append_stock({
+                "symbol": get("symbol", ""),
+                "company_name": get("name", ""),
+                "price": {
+                    "current": get("price", 0),
+                    "open": get("open", 0),
+                    "previous_close": get("previous_close", 0)
+                },
+                "change": {
+                    "amount": change,
+                    "percentage": change_percent_float,
+                    "is_positive": is_positive,
+                    "formatted": f"{change:+.2f} ({change_percent_float:+.2f}%)"
+                },
+                "volume": get("volume", 0),
+                "market_cap": get("market_cap", 0),
+                "rank": rank,
+                "timestamp": get("timestamp", now_iso),
+                "mock": mock
+            })
+        
+        return {
+            "stocks": formatted_stocks,
+            "total_count": len(formatted_stocks),
+            "last_updated": now_iso,
+            "market": self._MARKET,
+            "sort_by": self._SORT_BY
+        }, has_mock
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate top stocks widget configuration"""
-        required_fields = ["size", "theme"]
-        optional_fields = ["refreshInterval", "showVolume", "showChange", "showMarketCap", "sortBy", "market"]
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate size
-        if config["size"] not in self.get_widget_size_options():
+        if config["size"] not in self._SIZE_OPTIONS:
             return False
         
         # Validate theme
-        if config["theme"] not in self.get_theme_options():
+        if config["theme"] not in self._THEME_OPTIONS:
             return False
         
         # Validate sort by
         if "sortBy" in config:
-            if config["sortBy"] not in ["volume", "change", "market_cap"]:
+            if config["sortBy"] not in self._SORT_OPTIONS:
                 return False
         
         # Validate market
         if "market" in config:
-            if config["market"] not in ["US", "EU", "ASIA"]:
+            if config["market"] not in self._MARKETS:
                 return False
         
         return True
     
-    def get_required_fields(self) -> List[str]:
-        return ["symbol", "price", "volume"]
+    def get_required_fields(self) -> Sequence[str]:
+        return self._REQUIRED_FIELDS
     
-    def get_optional_fields(self) -> List[str]:
-        return ["change", "market_cap", "company_name", "rank"]
+    def get_optional_fields(self) -> Sequence[str]:
+        return self._OPTIONAL_FIELDS
     
     def get_display_template(self) -> str:
         return "top_stocks"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        return [
-            self.create_action("refresh"),
-            self.create_action("configure"),
-            {
-                "type": "sort",
-                "label": "Sort by Volume",
-                "icon": "sort",
-                "description": "Sort stocks by trading volume"
-            },
-            {
-                "type": "sort",
-                "label": "Sort by Change",
-                "icon": "trending_up",
-                "description": "Sort stocks by price change"
-            },
-            {
-                "type": "export",
-                "label": "Export Data",
-                "icon": "download",
-                "description": "Export top stocks data"
-            }
-        ]
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now_iso = datetime.now().isoformat()
         return {
-            "id": f"top_stocks_error_{int(datetime.now().timestamp())}",
+            "id": f"top_stocks_error_{self.next_id_suffix()}",
             "type": "top_stocks",
             "title": "Top Stocks Widget Error",
             "data": {
                 "error": error_message,
                 "stocks": [],
                 "total_count": 0,
-                "last_updated": datetime.now().isoformat(),
-                "market": "US",
-                "sort_by": "volume"
+                "last_updated": now_iso,
+                "market": self._MARKET,
+                "sort_by": self._SORT_BY
             },
             "config": self.default_config,
-            "actions": [self.create_action("refresh")],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now_iso,
+                "updated_at": now_iso,
                 "source": "error",
                 "version": "1.0.0"
             }
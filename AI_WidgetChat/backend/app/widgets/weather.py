@@ -1,43 +1,81 @@
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional, Sequence
 from datetime import datetime
-from app.widgets.base import BaseWidget
+from app.widgets.base import BaseWidget, make_id_key
 
 
 class WeatherWidget(BaseWidget):
     """Weather widget implementation"""
     
+    __slots__ = ()
+    
+    _DEFAULT_CONFIG = {
+        "size": "medium",
+        "theme": "auto",
+        "refreshInterval": 300,  # 5 minutes
+        "showDetails": True,
+        "showForecast": False,
+        "temperatureUnit": "celsius",  # celsius or fahrenheit
+        "showWind": True,
+        "showHumidity": True
+    }
+    
+    _SUPPORTED_ACTIONS = (
+        BaseWidget.COMMON_ACTIONS["refresh"],
+        BaseWidget.COMMON_ACTIONS["configure"],
+        {
+            "type": "forecast",
+            "label": "7-Day Forecast",
+            "icon": "calendar",
+            "description": "View 7-day weather forecast"
+        }
+    )
+    
+    _TEMPERATURE_UNITS = frozenset({"celsius", "fahrenheit"})
+    
+    _EMPTY_DATA = {
+        "location": {"name": "Unknown", "country": ""},
+        "current": {
+            "temperature": 0,
+            "feels_like": 0,
+            "description": "Unable to load weather data",
+            "icon": "error"
+        },
+        "details": {
+            "humidity": 0,
+            "pressure": 0,
+            "wind_speed": 0,
+            "visibility": 0
+        }
+    }
+    
+    _REQUIRED_FIELDS = ("location", "temperature", "description")
+    _OPTIONAL_FIELDS = ("humidity", "pressure", "wind_speed", "visibility", "feels_like", "icon")
+    
     def get_widget_type(self) -> str:
         return "weather"
     
-    def get_default_config(self) -> Dict[str, Any]:
-        return {
-            "size": "medium",
-            "theme": "auto",
-            "refreshInterval": 300,  # 5 minutes
-            "showDetails": True,
-            "showForecast": False,
-            "temperatureUnit": "celsius",  # celsius or fahrenheit
-            "showWind": True,
-            "showHumidity": True
-        }
+    @classmethod
+    def get_default_config(cls) -> Dict[str, Any]:
+        return cls._DEFAULT_CONFIG
     
-    def create_widget_data(self, location: str, weather_data: Dict[str, Any]) -> Dict[str, Any]:
+    def create_widget_data(self, location: str, weather_data: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
         """Create weather widget data"""
         try:
+            now_iso = (now or datetime.now()).isoformat()
             # Format the weather data
-            formatted_data = self.format_data(weather_data)
+            formatted_data = self.format_data(weather_data, now_iso=now_iso)
             
             # Create widget protocol
             widget_data = {
-                "id": f"weather_{location.lower().replace(' ', '_')}_{int(datetime.now().timestamp())}",
+                "id": f"weather_{make_id_key(location, ' ')}_{self.next_id_suffix()}",
                 "type": "weather",
                 "title": f"Weather in {location}",
                 "data": formatted_data,
                 "config": self.default_config,
                 "actions": self.get_supported_actions(),
                 "metadata": {
-                    "created_at": datetime.now().isoformat(),
-                    "updated_at": datetime.now().isoformat(),
+                    "created_at": now_iso,
+                    "updated_at": now_iso,
                     "source": "openweathermap" if not weather_data.get("mock") else "mock",
                     "version": "1.0.0"
                 }
@@ -48,106 +86,78 @@ class WeatherWidget(BaseWidget):
         except Exception as e:
             return self._create_error_widget(f"Failed to create weather widget: {str(e)}")
     
-    def format_data(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    def format_data(self, raw_data: Dict[str, Any], now_iso: Optional[str] = None) -> Dict[str, Any]:
         """Format weather data for display"""
         try:
+            get = raw_data.get
             return {
                 "location": {
-                    "name": raw_data.get("location", "Unknown"),
-                    "country": raw_data.get("country", "")
+                    "name": get("location", "Unknown"),
+                    "country": get("country", "")
                 },
                 "current": {
-                    "temperature": raw_data.get("temperature", 0),
-                    "feels_like": raw_data.get("feels_like", 0),
-                    "description": raw_data.get("description", "Unknown"),
-                    "icon": raw_data.get("icon", "01d")
+                    "temperature": get("temperature", 0),
+                    "feels_like": get("feels_like", 0),
+                    "description": get("description", "Unknown"),
+                    "icon": get("icon", "01d")
                 },
                 "details": {
-                    "humidity": raw_data.get("humidity", 0),
-                    "pressure": raw_data.get("pressure", 0),
-                    "wind_speed": raw_data.get("wind_speed", 0),
-                    "visibility": raw_data.get("visibility", 0)
+                    "humidity": get("humidity", 0),
+                    "pressure": get("pressure", 0),
+                    "wind_speed": get("wind_speed", 0),
+                    "visibility": get("visibility", 0)
                 },
-                "timestamp": raw_data.get("timestamp", datetime.now().isoformat()),
-                "mock": raw_data.get("mock", False)
+                "timestamp": get("timestamp") or now_iso or datetime.now().isoformat(),
+                "mock": get("mock", False)
             }
         except Exception as e:
             return {"error": str(e)}
     
     def validate_config(self, config: Dict[str, Any]) -> bool:
         """Validate weather widget configuration"""
-        required_fields = ["size", "theme"]
-        optional_fields = ["refreshInterval", "showDetails", "showForecast", "temperatureUnit", "showWind", "showHumidity"]
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in config:
-                return False
+        if not self._REQUIRED_CONFIG_FIELDS <= config.keys():
+            return False
         
         # Validate size
-        if config["size"] not in self.get_widget_size_options():
+        if config["size"] not in self._SIZE_OPTIONS:
             return False
         
         # Validate theme
-        if config["theme"] not in self.get_theme_options():
+        if config["theme"] not in self._THEME_OPTIONS:
             return False
         
         # Validate temperature unit
         if "temperatureUnit" in config:
-            if config["temperatureUnit"] not in ["celsius", "fahrenheit"]:
+            if config["temperatureUnit"] not in self._TEMPERATURE_UNITS:
                 return False
         
         return True
     
-    def get_required_fields(self) -> List[str]:
-        return ["location", "temperature", "description"]
+    def get_required_fields(self) -> Sequence[str]:
+        return self._REQUIRED_FIELDS
     
-    def get_optional_fields(self) -> List[str]:
-        return ["humidity", "pressure", "wind_speed", "visibility", "feels_like", "icon"]
+    def get_optional_fields(self) -> Sequence[str]:
+        return self._OPTIONAL_FIELDS
     
     def get_display_template(self) -> str:
         return "weather"
     
-    def get_supported_actions(self) -> List[Dict[str, Any]]:
-        return [
-            self.create_action("refresh"),
-            self.create_action("configure"),
-            {
-                "type": "forecast",
-                "label": "7-Day Forecast",
-                "icon": "calendar",
-                "description": "View 7-day weather forecast"
-            }
-        ]
+    def get_supported_actions(self) -> Sequence[Dict[str, Any]]:
+        return self._SUPPORTED_ACTIONS
     
     def _create_error_widget(self, error_message: str) -> Dict[str, Any]:
         """Create error widget when data loading fails"""
+        now_iso = datetime.now().isoformat()
         return {
-            "id": f"weather_error_{int(datetime.now().timestamp())}",
+            "id": f"weather_error_{self.next_id_suffix()}",
             "type": "weather",
             "title": "Weather Widget Error",
-            "data": {
-                "error": error_message,
-                "location": {"name": "Unknown", "country": ""},
-                "current": {
-                    "temperature": 0,
-                    "feels_like": 0,
-                    "description": "Unable to load weather data",
-                    "icon": "error"
-                },
-                "details": {
-                    "humidity": 0,
-                    "pressure": 0,
-                    "wind_speed": 0,
-                    "visibility": 0
-                },
-                "timestamp": datetime.now().isoformat()
-            },
+            "data": {"error": error_message, **self._EMPTY_DATA, "timestamp": now_iso},
             "config": self.default_config,
-            "actions": [self.create_action("refresh")],
+            "actions": self.ERROR_ACTIONS,
             "metadata": {
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
+                "created_at": now_iso,
+                "updated_at": now_iso,
                 "source": "error",
                 "version": "1.0.0"
             }
@@ -3,11 +3,23 @@
 Startup script for the AI Widget Chat backend
 """
 
+import hashlib
 import os
 import sys
 import subprocess
 from pathlib import Path
 
+def get_database_url(env_file):
+    """Return the database URL the backend will use: the environment, then .env, then the SQLite default"""
+    database_url = os.environ.get("DATABASE_URL")
+    if database_url:
+        return database_url
+    for line in env_file.read_text().splitlines():
+        key, separator, value = line.partition("=")
+        if separator and key.strip() == "DATABASE_URL":
+            return value.strip()
+    return "sqlite:///./database/ai_widget_chat.db"
+
 def main():
     # Get the project root directory
     project_root = Path(__file__).parent
@@ -25,14 +37,21 @@ def main():
     # Determine the correct Python executable
     if os.name == 'nt':  # Windows
         python_exe = venv_path / "Scripts" / "python.exe"
-        pip_exe = venv_path / "Scripts" / "pip.exe"
     else:  # Unix-like
         python_exe = venv_path / "bin" / "python"
-        pip_exe = venv_path / "bin" / "pip"
     
-    # Install requirements
-    print("Installing requirements...")
-    subprocess.run([str(pip_exe), "install", "-r", "requirements.txt"], check=True)
+    # Install requirements, skipping pip when requirements.txt is unchanged since the last install
+    requirements_hash = hashlib.sha256((backend_dir / "requirements.txt").read_bytes()).hexdigest()
+    requirements_stamp = venv_path / ".requirements.sha256"
+    if not requirements_stamp.exists() or requirements_stamp.read_text() != requirements_hash:
+        print("Installing requirements...")
+        subprocess.run(
+            [str(python_exe), "-m", "pip", "install", "--disable-pip-version-check", "--no-input", "-r", "requirements.txt"],
+            check=True
+        )
+        requirements_stamp.write_text(requirements_hash)
+    else:
+        print("Requirements are up to date.")
     
     # Create .env file if it doesn't exist
     env_file = backend_dir / ".env"
@@ -76,8 +95,27 @@ MAX_WIDGETS_PER_RESPONSE=5
     print("API documentation at: http://localhost:8000/docs")
     print("Press Ctrl+C to stop the server")
     
+    uvicorn_cmd = [str(python_exe), "-m", "uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000"]
+    
+    # uvicorn[standard] ships uvloop and httptools; uvloop is not available on Windows
+    if os.name != 'nt':
+        uvicorn_cmd += ["--loop", "uvloop", "--http", "httptools"]
+    
+    # Auto-reload for development by default; BACKEND_RELOAD=false runs one worker per CPU instead.
+    # Every worker creates the tables on startup and SQLite allows one writer at a time,
+    # so a SQLite database keeps a single worker.
+    if os.environ.get("BACKEND_RELOAD", "true").lower() == "false":
+        if get_database_url(env_file).startswith("sqlite"):
+            print("SQLite database: running a single worker (use a server database for more)")
+            workers = 1
+        else:
+            workers = os.cpu_count() or 1
+        uvicorn_cmd += ["--workers", str(workers)]
+    else:
+        uvicorn_cmd.append("--reload")
+    
     try:
-        subprocess.run([str(python_exe), "-m", "uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000", "--reload"], check=True)
+        subprocess.run(uvicorn_cmd, check=True)
     except KeyboardInterrupt:
         print("\nServer stopped.")
 
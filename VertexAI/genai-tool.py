@@ -1,8 +1,67 @@
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import time
+import numpy as np
 import vertexai
-from vertexai.preview.generative_models import GenerativeModel, Tool, FunctionDeclaration, AutomaticFunctionCallingResponder
+from google.cloud import storage
+from google.protobuf import json_format
+from google.protobuf.struct_pb2 import Struct
+from vertexai.batch_prediction import BatchPredictionJob
+from vertexai.language_models import TextEmbeddingInput, TextEmbeddingModel
+from vertexai.preview.generative_models import GenerativeModel, GenerationConfig, Tool, CallableFunctionDeclaration, AutomaticFunctionCallingResponder, Content, Part
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache, partial
 from urllib.parse import quote_plus
 import random
+import re
+
+logger = logging.getLogger(__name__)
+
+_UTC = timezone.utc
+
+# The mock stock prices' generator, kept apart from the global random state
+_rng = random.Random()
+
+# The current UTC time in ISO 8601 to the second, formatted once per second.
+# The (second, iso_time) pair is replaced as a whole, so threads never see a
+# mismatched pair.
+_iso_now_cache = (0, "")
+
+def _iso_now():
+    global _iso_now_cache
+    second = int(time.time())
+    cached_second, iso_time = _iso_now_cache
+    if second != cached_second:
+        iso_time = datetime.fromtimestamp(second, _UTC).isoformat(timespec="seconds")
+        _iso_now_cache = (second, iso_time)
+    return iso_time
+
+# The tools return protobuf Structs, which the SDK sends back as function responses
+# as they are instead of converting a dict field by field. Each payload starts as a
+# copy of a prebuilt template holding its constant fields. A function response is
+# always a Struct on the wire, so returning pre-encoded JSON would only reach the
+# model as an opaque string field.
+def _widget_template(widget: str, **props):
+    template = Struct()
+    template["widget"] = widget
+    template.get_or_create_struct("props").update(props)
+    return template
+
+def _new_widget(template):
+    widget = Struct()
+    widget.CopyFrom(template)
+    return widget, widget["props"]
+
+_WEATHER_TEMPLATE = _widget_template("weather", summary="Super nice, but maybe a bit hot.")
+_WATCH_TEMPLATE = _widget_template("watch")
+_STOCK_TEMPLATE = _widget_template("stock")
+_PHOTO_TEMPLATE = _widget_template("photo")
 
 # First, create functions that the model can use to answer your questions.
 def get_current_weather(location: str, unit: str = "centigrade"):
@@ -12,14 +71,10 @@ def get_current_weather(location: str, unit: str = "centigrade"):
         location: The location for which to get the weather.
         unit: Optional. Temperature unit. Can be Centigrade or Fahrenheit. Defaults to Centigrade.
     """
-    return dict(
-        widget="weather",
-        props=dict(
-            location=location,
-            unit=unit,
-            summary="Super nice, but maybe a bit hot.",
-        ),
-    )
+    widget, props = _new_widget(_WEATHER_TEMPLATE)
+    props["location"] = location
+    props["unit"] = unit
+    return widget
 
 # Add an additional tool-enabled function to provide current time
 def get_current_time(timezone_name: str = "UTC"):
@@ -28,14 +83,10 @@ def get_current_time(timezone_name: str = "UTC"):
     Args:
         timezone_name: Optional. Name of timezone (informational only). Defaults to UTC.
     """
-    now = datetime.now(timezone.utc)
-    return dict(
-        widget="watch",
-        props=dict(
-            timezone=timezone_name,
-            iso_time=now.isoformat(),
-        ),
-    )
+    widget, props = _new_widget(_WATCH_TEMPLATE)
+    props["timezone"] = timezone_name
+    props["iso_time"] = _iso_now()
+    return widget
 
 # Stock price widget tool
 def get_stock_quote(symbol: str, currency: str = "USD"):
@@ -45,17 +96,12 @@ def get_stock_quote(symbol: str, currency: str = "USD"):
         symbol: Stock ticker symbol, e.g., AAPL, GOOGL
         currency: Optional. Currency code. Defaults to USD.
     """
-    price = round(random.uniform(10, 1000), 2)
-    as_of = datetime.now(timezone.utc).isoformat()
-    return dict(
-        widget="stock",
-        props=dict(
-            symbol=symbol.upper(),
-            price=price,
-            currency=currency,
-            as_of=as_of,
-        ),
-    )
+    widget, props = _new_widget(_STOCK_TEMPLATE)
+    props["symbol"] = symbol.upper()
+    props["price"] = round(10 + _rng.random() * 990, 2)
+    props["currency"] = currency
+    props["as_of"] = _iso_now()
+    return widget
 
 # Photo widget tool
 def get_photo(query: str):
@@ -65,72 +111,481 @@ def get_photo(query: str):
         query: Subject to search for a photo.
     """
     seed = quote_plus(query.strip()) or "default"
-    url = f"https://picsum.photos/seed/{seed}/600/400"
-    return dict(
-        widget="photo",
-        props=dict(
-            query=query,
-            url=url,
-        ),
+    widget, props = _new_widget(_PHOTO_TEMPLATE)
+    props["query"] = query
+    props["url"] = f"https://picsum.photos/seed/{seed}/600/400"
+    return widget
+
+# The widget functions by the kind of widget they build
+WIDGET_FUNCTIONS = {
+    "weather": get_current_weather,
+    "watch": get_current_time,
+    "stock": get_stock_quote,
+    "photo": get_photo,
+}
+
+_WIDGET_PARAMETERS = {
+    kind: inspect.signature(widget_function).parameters
+    for kind, widget_function in WIDGET_FUNCTIONS.items()
+}
+
+def render_widget(kind: str, params: dict = None):
+    """Builds the payload of the widget of the given kind.
+
+    Parameters that don't belong to the kind are ignored. An unknown kind or a
+    missing required parameter gives an {"error": ...} result for the model to
+    correct instead of raising.
+    """
+    parameters = _WIDGET_PARAMETERS.get(kind)
+    if parameters is None:
+        return {"error": f"Unknown widget kind {kind!r}; use one of {', '.join(WIDGET_FUNCTIONS)}."}
+    params = {name: value for name, value in (params or {}).items() if name in parameters}
+    missing = [
+        name for name, parameter in parameters.items()
+        if parameter.default is parameter.empty and name not in params
+    ]
+    if missing:
+        return {"error": f"Missing required params for {kind}: {', '.join(missing)}."}
+    return WIDGET_FUNCTIONS[kind](**params)
+
+# A single tool that takes the widget kind and its parameters, so the model picks
+# the widget and fills in its parameters in one call against a small schema.
+# The schema mirrors the signatures and docstrings of the widget functions above.
+@lru_cache(maxsize=1)
+def get_widget_tool():
+    render_widget_func = CallableFunctionDeclaration(
+        name="render_widget",
+        function=render_widget,
+        description="Builds the widget to display for the user's message.",
+        parameters={
+            "type": "object",
+            "properties": {
+                "kind": {
+                    "type": "string",
+                    "enum": list(WIDGET_FUNCTIONS),
+                    "description": (
+                        "weather: the weather in a location. watch: the current time. "
+                        "stock: a stock quote. photo: a representative photo."
+                    ),
+                },
+                "params": {
+                    "type": "object",
+                    "description": (
+                        "Parameters for the widget kind. weather: location (required), unit. "
+                        "watch: timezone_name. stock: symbol (required), currency. photo: query (required)."
+                    ),
+                    "properties": {
+                        "location": {"type": "string", "description": "The location for which to get the weather."},
+                        "unit": {"type": "string", "description": "Optional. Temperature unit. Can be Centigrade or Fahrenheit. Defaults to Centigrade."},
+                        "timezone_name": {"type": "string", "description": "Optional. Name of timezone (informational only). Defaults to UTC."},
+                        "symbol": {"type": "string", "description": "Stock ticker symbol, e.g., AAPL, GOOGL"},
+                        "currency": {"type": "string", "description": "Optional. Currency code. Defaults to USD."},
+                        "query": {"type": "string", "description": "Subject to search for a photo."},
+                    },
+                },
+            },
+            "required": ["kind", "params"],
+        },
+    )
+    # Vertex AI requires function declarations to be in a single Tool unless all are search tools
+    return Tool(function_declarations=[render_widget_func])
+
+def get_callable_functions(tools):
+    """Map function names to the callable declarations of the given tools."""
+    callable_functions = {}
+    for tool in tools:
+        for name, callable_function in tool._callable_functions.items():
+            if name in callable_functions:
+                raise ValueError(
+                    "Multiple functions with the same name are not supported."
+                    f" Found {callable_functions[name]} and {callable_function}."
+                )
+            callable_functions[name] = callable_function
+    return callable_functions
+
+def call_function(callable_functions, function_call):
+    """Run a function call requested by the model and wrap its result as a response part.
+
+    Failures are reported back to the model as an {"error": ...} result rather than
+    raised, so one bad call doesn't abort the other queries being routed.
+    """
+    callable_function = callable_functions.get(function_call.name)
+    if not callable_function:
+        result = {"error": f"""Function "{function_call.name}" was not found."""}
+    else:
+        try:
+            result = callable_function._function(**function_call.args)
+        except Exception as ex:
+            result = {"error": f"""Error raised when calling function "{function_call.name}": {ex}"""}
+    if not isinstance(result, Mapping):
+        result = {"result": result}
+    return Part.from_function_response(name=function_call.name, response=result)
+
+def _raise_too_many_function_calls(max_automatic_function_calls, function_calls):
+    raise RuntimeError(
+        f"Exceeded the maximum number of automatic function calls ({max_automatic_function_calls})."
+        " If more automatic function calls are needed, set `max_automatic_function_calls` to a higher number."
+        f" The last function calls: {function_calls}"
     )
 
-# Infer function schema
-get_current_weather_func = FunctionDeclaration.from_func(get_current_weather)
+# Automatic function calling that runs all the function calls of one model turn
+# concurrently (e.g. weather and a stock quote for the same message) and sends
+# their results back together, instead of calling the tools one after another.
+class ParallelFunctionCallingResponder(AutomaticFunctionCallingResponder):
+    def __init__(self, max_automatic_function_calls: int = 1, max_workers: int = 4):
+        super().__init__(max_automatic_function_calls=max_automatic_function_calls)
+        self._max_workers = max_workers
 
-# Time tool
-get_current_time_func = FunctionDeclaration.from_func(get_current_time)
+    def _create_responder_for_message(self, tools):
+        return ParallelFunctionCallingResponder._MessageResponder(
+            tools=tools,
+            max_automatic_function_calls=self._max_automatic_function_calls,
+            max_workers=self._max_workers,
+        )
 
-get_stock_quote_func = FunctionDeclaration.from_func(get_stock_quote)
+    class _MessageResponder(AutomaticFunctionCallingResponder._MessageResponder):
+        def __init__(self, *, max_workers: int = 4, **kwargs):
+            super().__init__(**kwargs)
+            self._max_workers = max_workers
 
-get_photo_func = FunctionDeclaration.from_func(get_photo)
+        def respond_to_model_response(self, *, response, **_):
+            function_calls = response.candidates[0].function_calls
+            if not function_calls:
+                return None
+            if len(function_calls) > self._remaining_function_calls:
+                _raise_too_many_function_calls(self._max_automatic_function_calls, function_calls)
+            self._remaining_function_calls -= len(function_calls)
 
-# Consolidate all functions into a single Tool (Vertex AI requires this unless all are search tools)
-widget_tool = Tool(
-    function_declarations=[
-        get_current_weather_func,
-        get_current_time_func,
-        get_stock_quote_func,
-        get_photo_func,
-    ],
-)
+            callable_functions = get_callable_functions(self._tools)
+            call = partial(call_function, callable_functions)
 
-# Use tools in chat:
-vertexai.init(project='genai-472800', location='us-central1')
-model = GenerativeModel(
-    "gemini-2.5-flash",
-    # You can specify tools when creating a model to avoid having to send them with every request.
-    tools=[widget_tool],
-)
+            if len(function_calls) == 1:
+                parts = [call(function_calls[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=min(self._max_workers, len(function_calls))) as executor:
+                    parts = list(executor.map(call, function_calls))
+            return Content(parts=parts)
 
-# Activate automatic function calling:
-afc_responder = AutomaticFunctionCallingResponder(
-    # Optional:
-    max_automatic_function_calls=5,
-)
-chat = model.start_chat(responder=afc_responder)
-
-# Send a message to the model. The model will choose an appropriate tool and
-# respond ONLY with a JSON widget payload: {"widget": <type>, "props": {...}}
-# user_query = "Show me AAPL stock price"
-# instruction = (
-#     "You are a widget router. Based on the user's message, select exactly one widget "
-#     "to display and call the appropriate tool. Always respond ONLY with a compact JSON "
-#     "object using keys 'widget' and 'props'. No prose."
-# )
-# print(chat.send_message(f"{instruction}\nUser: {user_query}"))
-
-# user_query = "What is the weather like in Boston?"
-# instruction = (
-#     "You are a widget router. Based on the user's message, select exactly one widget "
-#     "to display and call the appropriate tool. Always respond ONLY with a compact JSON "
-#     "object using keys 'widget' and 'props'. No prose."
-# )
-# print(chat.send_message(f"{instruction}\nUser: {user_query}"))
-
-user_query = "Show me a photo of a sunset over the mountains."
-instruction = (
+# The model will choose an appropriate widget by calling the tool; the widget payload
+# {"widget": <type>, "props": {...}} is the tool's own result, so it is always
+# well-formed and the model's reply text is not parsed. The instruction is a fixed
+# string given to the model as its system instruction, so it forms a stable prompt
+# prefix and is not resent with every message.
+WIDGET_ROUTER_INSTRUCTION = (
     "You are a widget router. Based on the user's message, select exactly one widget "
-    "to display and call the appropriate tool. Always respond ONLY with a compact JSON "
-    "object using keys 'widget' and 'props'. No prose."
+    "to display and call the tool for it.\n"
+    "Examples:\n"
+    "User: What's the weather in Tokyo? -> render_widget(kind='weather', params={'location': 'Tokyo'})\n"
+    "User: TSLA quote -> render_widget(kind='stock', params={'symbol': 'TSLA'})\n"
+    "User: Picture of a red panda -> render_widget(kind='photo', params={'query': 'red panda'})"
+)
+
+# Routing is a small task, so the lite model handles it; messages it routes without
+# calling the tool are retried on the larger model.
+ROUTER_MODEL_NAME = "gemini-2.5-flash-lite"
+ESCALATION_MODEL_NAME = "gemini-2.5-flash"
+
+@lru_cache(maxsize=1)
+def init_vertexai():
+    # gRPC keeps one HTTP/2 channel open for every call instead of REST requests
+    vertexai.init(project='genai-472800', location='us-central1', api_transport='grpc')
+
+# Use tools in chat. Vertex AI is initialised and each model is built only once;
+# every chat below reuses the same model and its compiled tool.
+@lru_cache(maxsize=None)
+def get_model(model_name: str = ROUTER_MODEL_NAME):
+    init_vertexai()
+    return GenerativeModel(
+        model_name,
+        # The tool is mounted on the model once; don't pass tools= to send_message, which
+        # would serialize the tool block again for every request.
+        tools=[get_widget_tool()],
+        system_instruction=[WIDGET_ROUTER_INSTRUCTION],
+    )
+
+def warm_up(model_name: str = ROUTER_MODEL_NAME):
+    """Send a one-token request to the router and embedding models before routing, so
+    the channel setup and auth token fetch don't land on the first user query."""
+    try:
+        get_model(model_name).generate_content("ping", generation_config=GenerationConfig(max_output_tokens=1))
+    except Exception:
+        logger.warning("Warm-up request to %s failed", model_name, exc_info=True)
+    # embed_query logs its own failure
+    embed_query("ping")
+
+MAX_AUTOMATIC_FUNCTION_CALLS = 5
+
+def start_chat(model_name: str = ROUTER_MODEL_NAME):
+    """Start a new chat on the shared model with automatic function calling."""
+    # Activate automatic function calling:
+    afc_responder = ParallelFunctionCallingResponder(
+        # Optional:
+        max_automatic_function_calls=MAX_AUTOMATIC_FUNCTION_CALLS,
+    )
+    return get_model(model_name).start_chat(responder=afc_responder)
+
+def get_widget_payload(contents):
+    """Return the widget payload of the last successful render_widget result in the contents, or None."""
+    for content in reversed(contents):
+        for part in reversed(content.parts):
+            function_response = part.to_dict().get("function_response")
+            if function_response and function_response["name"] == "render_widget" and "widget" in function_response["response"]:
+                return function_response["response"]
+    return None
+
+def get_widget_call(contents):
+    """Return the args (kind and params) of the last successful render_widget call in the contents, or None.
+
+    Function responses follow their calls in the same order, so each response is
+    matched with the oldest call that has not been answered yet.
+    """
+    pending_calls = []
+    widget_call = None
+    for content in contents:
+        for part in content.parts:
+            part = part.to_dict()
+            if "function_call" in part:
+                pending_calls.append(part["function_call"])
+            elif "function_response" in part and pending_calls:
+                function_call = pending_calls.pop(0)
+                if function_call["name"] == "render_widget" and "widget" in part["function_response"]["response"]:
+                    widget_call = function_call.get("args", {})
+    return widget_call
+
+# Routed responses are cached per normalized query, so repeating a query skips the
+# model round-trip. Stock and watch widgets carry live prices and times, so they are
+# never stored, whatever words the query used.
+_RESPONSE_CACHE_SIZE = 1024
+_response_cache = OrderedDict()
+_UNCACHEABLE_WIDGETS = frozenset({"stock", "watch"})
+
+def _cache_key(user_query: str):
+    return " ".join(user_query.split()).lower()
+
+def _is_cacheable(response):
+    return response is not None and response["widget"] not in _UNCACHEABLE_WIDGETS
+
+def _get_cached_response(key):
+    response = _response_cache.get(key)
+    if response is not None:
+        _response_cache.move_to_end(key)
+    return response
+
+def _cache_response(key, response):
+    _response_cache[key] = response
+    if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+        _response_cache.popitem(last=False)
+
+# Queries missing from the exact cache are also matched by meaning: the widget call
+# (kind and params) of a previous query whose embedding has a cosine similarity of at
+# least the threshold is rendered again, e.g. "weather in boston" for "how's the
+# weather in boston today". Similar queries can still differ in their params
+# ("weather in cambridge"), so a call is only reused when each of its text params
+# appears as whole words in the new query. An embedding request is much cheaper and
+# faster than a routing round-trip.
+EMBEDDING_MODEL_NAME = "text-embedding-005"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+_semantic_cache_embeddings = None
+_semantic_cache_calls = []
+
+@lru_cache(maxsize=1)
+def get_embedding_model():
+    init_vertexai()
+    return TextEmbeddingModel.from_pretrained(EMBEDDING_MODEL_NAME)
+
+def _unit_vector(embeddings):
+    vector = np.asarray(embeddings[0].values)
+    return vector / np.linalg.norm(vector)
+
+# A failed embedding request gives None, so the query skips the semantic cache and
+# is routed as usual instead of failing (and failing its whole batch).
+def embed_query(key: str):
+    try:
+        return _unit_vector(get_embedding_model().get_embeddings([TextEmbeddingInput(key, "SEMANTIC_SIMILARITY")]))
+    except Exception:
+        logger.warning("Embedding request to %s failed; skipping the semantic cache", EMBEDDING_MODEL_NAME, exc_info=True)
+        return None
+
+async def embed_query_async(key: str):
+    try:
+        return _unit_vector(await get_embedding_model().get_embeddings_async([TextEmbeddingInput(key, "SEMANTIC_SIMILARITY")]))
+    except Exception:
+        logger.warning("Embedding request to %s failed; skipping the semantic cache", EMBEDDING_MODEL_NAME, exc_info=True)
+        return None
+
+def _params_in_query(params, key: str):
+    # Whole words only, so {"query": "cat"} doesn't match "picture of a caterpillar"
+    return all(
+        not isinstance(value, str) or re.search(rf"(?<!\w){re.escape(_cache_key(value))}(?!\w)", key)
+        for value in (params or {}).values()
+    )
+
+def _get_similar_response(embedding, key: str):
+    if embedding is None or not _semantic_cache_calls:
+        return None
+    similarities = _semantic_cache_embeddings @ embedding
+    for index in similarities.argsort()[::-1]:
+        if similarities[index] < SEMANTIC_CACHE_THRESHOLD:
+            break
+        call = _semantic_cache_calls[index]
+        if _params_in_query(call.get("params"), key):
+            result = render_widget(call["kind"], call.get("params"))
+            return json_format.MessageToDict(result) if isinstance(result, Struct) else None
+    return None
+
+def _cache_similar_call(embedding, call):
+    global _semantic_cache_embeddings
+    if embedding is None:
+        return
+    if _semantic_cache_embeddings is None:
+        _semantic_cache_embeddings = embedding[np.newaxis]
+    else:
+        _semantic_cache_embeddings = np.vstack((_semantic_cache_embeddings[-(_RESPONSE_CACHE_SIZE - 1):], embedding))
+        del _semantic_cache_calls[:-(_RESPONSE_CACHE_SIZE - 1)]
+    _semantic_cache_calls.append(call)
+
+def _send_and_get_payload(chat, user_query: str):
+    chat.send_message(user_query)
+    return get_widget_payload(chat.history), get_widget_call(chat.history)
+
+def route_query(user_query: str):
+    """Route a user message on a new chat and return the widget payload.
+
+    Each query gets its own chat, so earlier queries are neither resent nor able to
+    bias the routing.
+    """
+    key = _cache_key(user_query)
+    response = _get_cached_response(key)
+    if response is not None:
+        return response
+    embedding = embed_query(key)
+    response = _get_similar_response(embedding, key)
+    if response is not None:
+        _cache_response(key, response)
+        return response
+
+    response, call = _send_and_get_payload(start_chat(), user_query)
+    if response is None:
+        response, call = _send_and_get_payload(start_chat(ESCALATION_MODEL_NAME), user_query)
+    if _is_cacheable(response):
+        _cache_response(key, response)
+        _cache_similar_call(embedding, call)
+    return response
+
+async def send_message_streaming(chat, content, max_automatic_function_calls: int = MAX_AUTOMATIC_FUNCTION_CALLS):
+    """Send a message with streaming, running the requested tools as their calls arrive.
+
+    The chat's automatic function calling responder only applies to send_message,
+    so the function calls are handled here: each one starts in a worker thread as
+    soon as its chunk is received, while the rest of the response is still being
+    decoded, and their results are sent back once the turn is complete. Returns
+    the model's final content.
+    """
+    callable_functions = get_callable_functions([get_widget_tool()])
+    remaining_function_calls = max_automatic_function_calls
+    while True:
+        pending_calls = []
+        async for chunk in await chat.send_message_async(content, stream=True):
+            if not chunk.candidates:
+                continue
+            for function_call in chunk.candidates[0].function_calls:
+                if remaining_function_calls <= 0:
+                    _raise_too_many_function_calls(max_automatic_function_calls, [function_call])
+                remaining_function_calls -= 1
+                pending_calls.append(
+                    asyncio.create_task(asyncio.to_thread(call_function, callable_functions, function_call))
+                )
+        if not pending_calls:
+            return chat.history[-1]
+        content = await asyncio.gather(*pending_calls)
+
+async def _route_query_async(user_query: str):
+    key = _cache_key(user_query)
+    response = _get_cached_response(key)
+    if response is not None:
+        return response
+    embedding = await embed_query_async(key)
+    response = _get_similar_response(embedding, key)
+    if response is not None:
+        _cache_response(key, response)
+        return response
+
+    chat = start_chat()
+    await send_message_streaming(chat, user_query)
+    response = get_widget_payload(chat.history)
+    if response is None:
+        chat = start_chat(ESCALATION_MODEL_NAME)
+        await send_message_streaming(chat, user_query)
+        response = get_widget_payload(chat.history)
+    if _is_cacheable(response):
+        _cache_response(key, response)
+        _cache_similar_call(embedding, get_widget_call(chat.history))
+    return response
+
+async def route_queries(user_queries):
+    """Route several user messages concurrently.
+
+    Each query gets its own chat so the concurrent requests do not share history;
+    the tool functions stay synchronous and only the model calls are awaited.
+    The results are the widget payloads, or None for a query no widget was chosen for.
+    """
+    return await asyncio.gather(*(_route_query_async(user_query) for user_query in user_queries))
+
+def submit_batch(user_queries, gcs_prefix: str):
+    """Submit the queries as one Vertex AI batch prediction job.
+
+    Batch jobs are billed at half the interactive price and complete
+    asynchronously, for routing that doesn't need an immediate answer. The
+    requests are written as JSONL under gcs_prefix, where the job also writes
+    its output. The model's function calls are returned as-is; the tools are
+    not run.
+    """
+    init_vertexai()
+    request = {
+        "systemInstruction": {"parts": [{"text": WIDGET_ROUTER_INSTRUCTION}]},
+        "tools": [json_format.MessageToDict(get_widget_tool()._raw_tool._pb)],
+    }
+    requests = "\n".join(
+        json.dumps({"request": {"contents": [{"role": "user", "parts": [{"text": user_query}]}], **request}})
+        for user_query in user_queries
+    )
+
+    gcs_prefix = gcs_prefix.rstrip("/")
+    bucket_name, _, prefix = gcs_prefix.removeprefix("gs://").partition("/")
+    blob_name = f"{prefix}/requests.jsonl" if prefix else "requests.jsonl"
+    storage.Client().bucket(bucket_name).blob(blob_name).upload_from_string(requests, content_type="application/jsonl")
+
+    return BatchPredictionJob.submit(
+        source_model=ROUTER_MODEL_NAME,
+        input_dataset=f"gs://{bucket_name}/{blob_name}",
+        output_uri_prefix=gcs_prefix,
+    )
+
+queries = [
+    # "Show me AAPL stock price",
+    # "What is the weather like in Boston?",
+    "Show me a photo of a sunset over the mountains.",
+]
+
+parser = argparse.ArgumentParser(description="Route user queries to widgets with Gemini.")
+parser.add_argument(
+    "--batch",
+    metavar="GCS_PREFIX",
+    help="submit the queries as a batch prediction job with its input and output under this gs:// prefix",
 )
-print(chat.send_message(f"{instruction}\nUser: {user_query}"))
\ No newline at end of file
+args = parser.parse_args()
+
+if args.batch:
+    job = submit_batch(queries, args.batch)
+    print(f"Submitted batch job {job.resource_name}")
+    while not job.has_ended:
+        time.sleep(30)
+        job.refresh()
+    if job.has_succeeded:
+        print(f"Batch output: {job.output_location}")
+    else:
+        print(f"Batch job failed: {job.error}")
+else:
+    warm_up()
+    for response in asyncio.run(route_queries(queries)):
+        print(response)